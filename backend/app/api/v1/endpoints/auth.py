@@ -2,14 +2,20 @@
 Authentication API endpoints
 """
 from typing import Any, Dict
+from dataclasses import asdict
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from app.core.auth import (
     create_user_session,
     register_user,
     get_current_user,
-    get_current_user_profile
+    get_current_user_profile,
+    revoke_token,
+    security,
+    UserPayload
 )
+from app.core.cache import async_ttl_cache
 from app.core.supabase_client import supabase_client
 import logging
 
@@ -62,20 +68,13 @@ async def login(request: LoginRequest) -> Dict[str, Any]:
         return {
             "access_token": session_data["access_token"],
             "token_type": "bearer",
-            "user": {
-                "id": user_data.id,
-                "email": user_data.email,
-                "full_name": user_data.user_metadata.get("full_name", ""),
-                "username": user_data.user_metadata.get("username", ""),
-                "created_at": str(user_data.created_at),
-                "email_confirmed_at": str(user_data.email_confirmed_at) if user_data.email_confirmed_at else ""
-            }
+            "user": UserResponse.model_construct(**asdict(UserPayload.from_supabase(user_data)))
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {e}")
+        logger.error("Login error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Login failed"
@@ -112,20 +111,13 @@ async def register(request: RegisterRequest) -> Dict[str, Any]:
         return {
             "access_token": session_data.access_token,
             "token_type": "bearer",
-            "user": {
-                "id": user_data.id,
-                "email": user_data.email,
-                "full_name": user_data.user_metadata.get("full_name", ""),
-                "username": user_data.user_metadata.get("username", ""),
-                "created_at": str(user_data.created_at),
-                "email_confirmed_at": str(user_data.email_confirmed_at) if user_data.email_confirmed_at else ""
-            }
+            "user": UserResponse.model_construct(**asdict(UserPayload.from_supabase(user_data)))
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Registration error: {e}")
+        logger.error("Registration error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Registration failed"
@@ -134,22 +126,15 @@ async def register(request: RegisterRequest) -> Dict[str, Any]:
 @router.get("/me", response_model=UserResponse)
 async def get_me(
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> UserResponse:
     """
     Get current user information
     """
     try:
-        return {
-            "id": current_user.get("sub", current_user.get("id", "")),
-            "email": current_user.get("email", ""),
-            "full_name": current_user.get("user_metadata", {}).get("full_name", ""),
-            "username": current_user.get("user_metadata", {}).get("username", ""),
-            "created_at": current_user.get("created_at", ""),
-            "email_confirmed_at": current_user.get("email_confirmed_at", "")
-        }
+        return UserResponse.model_construct(**asdict(UserPayload.from_user_dict(current_user)))
         
     except Exception as e:
-        logger.error(f"Get user info error: {e}")
+        logger.error("Get user info error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get user information"
@@ -172,25 +157,26 @@ async def get_profile(
 
 @router.post("/logout")
 async def logout(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, str]:
     """
-    User logout (invalidate session)
+    User logout (revoke the bearer token until it expires)
     """
     try:
-        if supabase_client.client:
-            supabase_client.client.auth.sign_out()
+        revoke_token(credentials.credentials)
         
         return {"message": "Successfully logged out"}
         
     except Exception as e:
-        logger.error(f"Logout error: {e}")
+        logger.error("Logout error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Logout failed"
         )
 
 @router.get("/status")
+@async_ttl_cache(ttl=30)
 async def auth_status() -> Dict[str, Any]:
     """
     Check authentication service status
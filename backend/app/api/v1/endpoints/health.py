@@ -3,29 +3,24 @@ Health check endpoints
 """
 from typing import Dict, Any
 from fastapi import APIRouter, status
-from datetime import datetime
 
+from app.core.cache import async_ttl_cache, utc_now_iso
 from app.core.config import settings
 
 router = APIRouter()
 
-@router.get("", status_code=status.HTTP_200_OK)
-async def health_check() -> Dict[str, str]:
-    """
-    Basic health check endpoint
-    """
+@async_ttl_cache(ttl=10)
+async def _health_body() -> Dict[str, str]:
+    """Health check fields that only change on redeploy (cached)"""
     return {
         "status": "healthy",
         "service": settings.PROJECT_NAME,
         "version": settings.VERSION,
-        "timestamp": datetime.utcnow().isoformat()
     }
 
-@router.get("/ready", status_code=status.HTTP_200_OK)
-async def readiness_check() -> Dict[str, Any]:
-    """
-    Detailed readiness check
-    """
+@async_ttl_cache(ttl=10)
+async def _readiness_body() -> Dict[str, Any]:
+    """Readiness check results (cached)"""
     checks = {
         "service": True,
         "config": bool(settings.SECRET_KEY),
@@ -37,5 +32,19 @@ async def readiness_check() -> Dict[str, Any]:
     return {
         "status": "ready" if all_ready else "not ready",
         "checks": checks,
-        "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    }
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def health_check() -> Dict[str, str]:
+    """
+    Basic health check endpoint
+    """
+    # The cached body is shared, so the fresh timestamp goes on a copy
+    return {**await _health_body(), "timestamp": utc_now_iso()}
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness_check() -> Dict[str, Any]:
+    """
+    Detailed readiness check
+    """
+    return {**await _readiness_body(), "timestamp": utc_now_iso()}
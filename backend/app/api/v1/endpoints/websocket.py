@@ -1,21 +1,39 @@
 """
 WebSocketライブ配信エンドポイント
+
+クライアントがサブプロトコル "prices.binary.v1" を要求した場合（msgpackが利用可能な
+場合のみ）、メッセージはJSONテキストの代わりにmsgpackのバイナリフレームで送信する。
+スキーマはJSONと同一（同じキーのmap、timestampはISO 8601文字列）で、
+複数メッセージは {"type": "batch", "items": [...]} にまとめられる。
 """
 
-import json
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Iterable, List, Optional, Set
 from datetime import datetime, time
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
 from fastapi.websockets import WebSocketState
 
-from app.services.data_source_router import DataSourceRouter, DataSource
+from app.services.data_source_router import DataSource, get_data_source_router
 from app.core.auth import get_current_user_from_token
+from app.core.responses import MSGPACK_AVAILABLE, dumps as orjson_dumps, msgpack_array_header, msgpack_dumps
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# ライブ配信設定
+STREAM_INTERVAL_SECONDS = 2.0  # 価格配信間隔
+QUIET_STREAM_INTERVAL_SECONDS = 10.0  # 価格に変化がない銘柄の取得間隔
+PRICE_FETCH_TIMEOUT = 1.8  # 1銘柄あたりの価格取得タイムアウト（配信間隔内に収める）
+PRICE_FETCH_CONCURRENCY = 8  # 上流データソースへの同時リクエスト数
+OUTBOUND_QUEUE_SIZE = 64  # 接続ごとの送信キュー上限（超過した遅いクライアントは切断）
+OUTBOUND_QUEUE_BYTES = 512 * 1024  # 接続ごとの送信待ちバイト数上限
+MAX_BATCH_SIZE = 100  # 1フレームにまとめる最大メッセージ数
+BINARY_SUBPROTOCOL = "prices.binary.v1"  # msgpackバイナリ配信のサブプロトコル名
+# バイナリ配信のbatchフレーム先頭（空配列ヘッダを除いた {"type": "batch", "items": ...}）
+BINARY_BATCH_PREFIX = msgpack_dumps({"type": "batch", "items": []})[:-1] if MSGPACK_AVAILABLE else b""
+SEND_TIMEOUT_SECONDS = 5.0  # 1フレームの送信タイムアウト（超過した遅いクライアントは切断）
+
 def is_trading_hours(now: datetime = None) -> bool:
     """
     日本株取引時間判定（平日9:00-15:00）
@@ -45,17 +63,35 @@ class ConnectionManager:
     
     def __init__(self):
         # 接続管理
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
         self.user_connections: Dict[str, WebSocket] = {}
         self.symbol_subscribers: Dict[str, Set[WebSocket]] = {}
+        # 接続ごとの購読銘柄（切断時に全銘柄を走査しないための逆引き）
+        self.ws_symbols: Dict[WebSocket, Set[str]] = {}
+        
+        # 接続ごとの送信キューと送信タスク（1接続につき送信者は1つ）
+        self._outbound: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        self._queued_bytes: Dict[WebSocket, int] = {}
+        # msgpackバイナリ配信を選択した接続
+        self._binary_connections: Set[WebSocket] = set()
         
-        # データソースルーター
-        self.data_router = DataSourceRouter()
+        # データソースルーター（HTTPエンドポイントと共有）
+        self.data_router = get_data_source_router()
         self.router_initialized = False
         
         # ライブ配信状態
         self.is_streaming = False
         self.streaming_symbols: Set[str] = set()
+        # 常駐の配信タスクと、購読銘柄の有無を知らせるイベント
+        self._streamer_task: Optional[asyncio.Task] = None
+        self._have_symbols = asyncio.Event()
+        # 配信待機中のタスクを起こす（新規購読の銘柄をすぐ取得する）
+        self._tick_wakeup = asyncio.Event()
+        self._price_semaphore = asyncio.Semaphore(PRICE_FETCH_CONCURRENCY)
+        # 銘柄ごとの最終配信値と次回取得時刻（変化のない配信を抑制）
+        self._last_price: Dict[str, tuple] = {}
+        self._next_tick_at: Dict[str, float] = {}
         
     async def initialize(self):
         """接続マネージャー初期化"""
@@ -76,22 +112,36 @@ class ConnectionManager:
             bool: 接続成功時True
         """
         try:
-            await websocket.accept()
-            self.active_connections.append(websocket)
+            # クライアントが要求した場合はmsgpackバイナリ配信を選択
+            binary = MSGPACK_AVAILABLE and BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+            await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if binary else None)
+            self.active_connections.add(websocket)
+            if binary:
+                self._binary_connections.add(websocket)
             
             if user_id:
                 self.user_connections[user_id] = websocket
                 
-            logger.info(f"WebSocket接続確立: {websocket.client.host} (User: {user_id})")
+            logger.info("WebSocket接続確立: %s (User: %s)", websocket.client.host, user_id)
             
             # 接続確認メッセージ送信
-            await websocket.send_json({
+            established = {
                 "type": "connection_established",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 "authenticated": user_id is not None,
                 "user_id": user_id,
                 "available_streams": ["price", "ai_decision", "market_status"]
-            })
+            }
+            if binary:
+                await websocket.send_bytes(msgpack_dumps(established))
+            else:
+                await websocket.send_text(orjson_dumps(established).decode())
+            
+            # 送信キューと送信タスクを開始
+            queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+            self._outbound[websocket] = queue
+            self._queued_bytes[websocket] = 0
+            self._writers[websocket] = asyncio.create_task(self._write_loop(websocket, queue, binary))
             
             return True
             
@@ -108,23 +158,193 @@ class ConnectionManager:
             user_id: ユーザーID
         """
         try:
+            # 送信タスクを停止
+            self._outbound.pop(websocket, None)
+            self._queued_bytes.pop(websocket, None)
+            writer = self._writers.pop(websocket, None)
+            if writer is not None:
+                writer.cancel()
+                
             # 接続リストから削除
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
+            self._binary_connections.discard(websocket)
                 
             if user_id and user_id in self.user_connections:
                 del self.user_connections[user_id]
                 
-            # シンボル購読から削除
-            for symbol, subscribers in self.symbol_subscribers.items():
-                if websocket in subscribers:
-                    subscribers.remove(websocket)
+            # シンボル購読から削除（この接続が購読していた銘柄のみ）
+            for symbol in self.ws_symbols.pop(websocket, ()):
+                self._remove_subscriber(symbol, websocket)
                     
-            logger.info(f"WebSocket切断完了: {websocket.client.host} (User: {user_id})")
+            logger.info("WebSocket切断完了: %s (User: %s)", websocket.client.host, user_id)
             
         except Exception as e:
             logger.error(f"WebSocket切断エラー: {str(e)}")
             
+    @staticmethod
+    def _encode(data: Dict[str, Any], binary: bool = False) -> Optional[bytes]:
+        """
+        送信データをシリアライズ（JSONはorjson、バイナリ配信はmsgpack）
+        
+        Args:
+            data: 送信データ
+            binary: msgpackでシリアライズする場合True
+            
+        Returns:
+            Optional[bytes]: シリアライズ済みバイト列（変換できない場合None）
+        """
+        try:
+            if binary:
+                return msgpack_dumps(data)
+            return orjson_dumps(data)
+        except (TypeError, ValueError) as e:
+            logger.warning("送信データのシリアライズエラー: %s", e)
+            return None
+            
+    def _enqueue(self, websocket: WebSocket, payload: bytes) -> bool:
+        """
+        接続の送信キューにシリアライズ済みメッセージを追加
+        
+        キューの件数・バイト数が上限を超える場合は遅いクライアントとして切断する
+        （接続ごとのメモリ使用量を上限内に抑え、配信全体を止めない）
+        
+        Args:
+            websocket: WebSocket接続
+            payload: シリアライズ済みバイト列
+            
+        Returns:
+            bool: キューに追加できた場合True（切断済み・切断した場合False）
+        """
+        queue = self._outbound.get(websocket)
+        if queue is None:
+            return False
+            
+        queued_bytes = self._queued_bytes.get(websocket, 0) + len(payload)
+        if queue.full() or queued_bytes > OUTBOUND_QUEUE_BYTES:
+            logger.warning("送信キュー上限超過のため接続を切断: %s", websocket.client.host)
+            writer = self._writers.get(websocket)
+            self._drop_outbound(websocket, queue)
+            if writer is not None:
+                writer.cancel()
+            asyncio.create_task(self._close_slow_consumer(websocket))
+            return False
+            
+        self._queued_bytes[websocket] = queued_bytes
+        queue.put_nowait(payload)
+        return True
+        
+    def send_to(self, websocket: WebSocket, data: Dict[str, Any]):
+        """
+        1接続へのメッセージ送信（送信キュー経由）
+        
+        Args:
+            websocket: WebSocket接続
+            data: 送信データ
+        """
+        payload = self._encode(data, websocket in self._binary_connections)
+        if payload is not None:
+            self._enqueue(websocket, payload)
+            
+    def _fan_out(self, connections: Iterable[WebSocket], data: Dict[str, Any]) -> List[WebSocket]:
+        """
+        複数接続の送信キューにメッセージを追加（形式ごとにシリアライズは1回のみ）
+        
+        Args:
+            connections: 配信先の接続
+            data: 配信データ
+            
+        Returns:
+            List[WebSocket]: 切断済みの接続
+        """
+        payloads: Dict[bool, Optional[bytes]] = {}
+        disconnected_connections = []
+        
+        # ループ内では集合を変更しない（切断分は呼び出し側でまとめて削除）ためコピー不要
+        for websocket in connections:
+            binary = websocket in self._binary_connections
+            if binary not in payloads:
+                payloads[binary] = self._encode(data, binary)
+            payload = payloads[binary]
+            if payload is None:
+                continue
+            if websocket.client_state != WebSocketState.CONNECTED or not self._enqueue(websocket, payload):
+                disconnected_connections.append(websocket)
+                
+        return disconnected_connections
+        
+    async def _write_loop(self, websocket: WebSocket, queue: asyncio.Queue, binary: bool = False):
+        """
+        送信キューを排出して送信
+        
+        待機中のメッセージが複数ある場合は {"type": "batch", "items": [...]} の
+        1フレームにまとめて送信し、書き込み回数を減らす
+        
+        Args:
+            websocket: WebSocket接続
+            queue: 送信キュー
+            binary: msgpackバイナリフレームで送信する場合True
+        """
+        try:
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < MAX_BATCH_SIZE:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                        
+                if websocket in self._queued_bytes:
+                    self._queued_bytes[websocket] -= sum(map(len, batch))
+                
+                # キューの中身はシリアライズ済みのため連結のみ
+                if len(batch) == 1:
+                    frame = batch[0]
+                elif binary:
+                    frame = BINARY_BATCH_PREFIX + msgpack_array_header(len(batch)) + b"".join(batch)
+                else:
+                    frame = b'{"type":"batch","items":[' + b",".join(batch) + b']}'
+                    
+                if binary:
+                    await asyncio.wait_for(websocket.send_bytes(frame), timeout=SEND_TIMEOUT_SECONDS)
+                else:
+                    # フロントエンドはテキストフレームをJSON.parseするためテキストで送信
+                    await asyncio.wait_for(websocket.send_text(frame.decode()), timeout=SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("送信タイムアウトのため接続を切断: %s", websocket.client.host)
+            self._drop_outbound(websocket, queue)
+            await self._close_slow_consumer(websocket)
+        except Exception as e:
+            # 切断済みの接続で発生するため通常運用ではログを出さない
+            logger.debug("送信エラー: %s", e)
+            self._drop_outbound(websocket, queue)
+            
+    def _drop_outbound(self, websocket: WebSocket, queue: asyncio.Queue):
+        """
+        送信を停止した接続のキューを外す（以降の配信で切断扱いとして購読から削除される）
+        
+        Args:
+            websocket: WebSocket接続
+            queue: 停止した送信タスクのキュー
+        """
+        if self._outbound.get(websocket) is queue:
+            del self._outbound[websocket]
+            self._writers.pop(websocket, None)
+            self._queued_bytes.pop(websocket, None)
+            
+    async def _close_slow_consumer(self, websocket: WebSocket):
+        """
+        遅いクライアントの接続を閉じる（クライアント側で再接続させる）
+        
+        Args:
+            websocket: WebSocket接続
+        """
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="slow consumer")
+        except Exception:
+            pass
+            
     async def subscribe_symbol(self, websocket: WebSocket, symbol: str):
         """
         銘柄購読開始
@@ -137,20 +357,46 @@ class ConnectionManager:
             self.symbol_subscribers[symbol] = set()
             
         self.symbol_subscribers[symbol].add(websocket)
+        self.ws_symbols.setdefault(websocket, set()).add(symbol)
         self.streaming_symbols.add(symbol)
         
-        logger.info(f"銘柄購読開始: {symbol} (購読者: {len(self.symbol_subscribers[symbol])})")
+        # 新しい購読者に現在値が届くよう、待機中でもすぐに取得・配信する
+        self._last_price.pop(symbol, None)
+        self._next_tick_at.pop(symbol, None)
+        self._tick_wakeup.set()
+        
+        logger.info("銘柄購読開始: %s (購読者: %d)", symbol, len(self.symbol_subscribers[symbol]))
         
         # 購読確認メッセージ
-        await websocket.send_json({
+        self.send_to(websocket, {
             "type": "subscription_confirmed",
             "symbol": symbol,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         })
         
-        # ライブストリーミング開始
-        if not self.is_streaming:
-            asyncio.create_task(self.start_price_streaming())
+        # 常駐の配信タスクに購読銘柄ができたことを通知
+        self._have_symbols.set()
+            
+    def _remove_subscriber(self, symbol: str, websocket: WebSocket):
+        """
+        銘柄の購読者から接続を削除（購読者がいなくなった銘柄は配信対象から外す）
+        
+        Args:
+            symbol: 銘柄コード
+            websocket: WebSocket接続
+        """
+        subscribers = self.symbol_subscribers.get(symbol)
+        if subscribers is None:
+            return
+            
+        subscribers.discard(websocket)
+        if not subscribers:
+            del self.symbol_subscribers[symbol]
+            self.streaming_symbols.discard(symbol)
+            self._last_price.pop(symbol, None)
+            self._next_tick_at.pop(symbol, None)
+            if not self.streaming_symbols:
+                self._have_symbols.clear()
             
     async def unsubscribe_symbol(self, websocket: WebSocket, symbol: str):
         """
@@ -160,20 +406,17 @@ class ConnectionManager:
             websocket: WebSocket接続
             symbol: 銘柄コード
         """
-        if symbol in self.symbol_subscribers and websocket in self.symbol_subscribers[symbol]:
-            self.symbol_subscribers[symbol].remove(websocket)
-            
-            # 購読者がいなくなった場合
-            if not self.symbol_subscribers[symbol]:
-                del self.symbol_subscribers[symbol]
-                self.streaming_symbols.discard(symbol)
+        self._remove_subscriber(symbol, websocket)
+        symbols = self.ws_symbols.get(websocket)
+        if symbols is not None:
+            symbols.discard(symbol)
                 
-        logger.info(f"銘柄購読停止: {symbol}")
+        logger.info("銘柄購読停止: %s", symbol)
         
-        await websocket.send_json({
+        self.send_to(websocket, {
             "type": "unsubscription_confirmed", 
             "symbol": symbol,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         })
         
     async def broadcast_to_symbol(self, symbol: str, data: Dict[str, Any]):
@@ -187,21 +430,15 @@ class ConnectionManager:
         if symbol not in self.symbol_subscribers:
             return
             
-        disconnected_connections = []
-        
-        for websocket in self.symbol_subscribers[symbol].copy():
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_json(data)
-                else:
-                    disconnected_connections.append(websocket)
-            except Exception as e:
-                logger.warning(f"配信エラー: {str(e)}")
-                disconnected_connections.append(websocket)
+        # 購読者数に関係なくシリアライズは形式ごとに1回のみ
+        disconnected_connections = self._fan_out(self.symbol_subscribers[symbol], data)
                 
         # 切断された接続を削除
         for websocket in disconnected_connections:
-            self.symbol_subscribers[symbol].discard(websocket)
+            self._remove_subscriber(symbol, websocket)
+            symbols = self.ws_symbols.get(websocket)
+            if symbols is not None:
+                symbols.discard(symbol)
             
     async def broadcast_to_all(self, data: Dict[str, Any]):
         """
@@ -210,97 +447,181 @@ class ConnectionManager:
         Args:
             data: 配信データ
         """
-        disconnected_connections = []
-        
-        for websocket in self.active_connections.copy():
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_json(data)
-                else:
-                    disconnected_connections.append(websocket)
-            except Exception as e:
-                logger.warning(f"一斉配信エラー: {str(e)}")
-                disconnected_connections.append(websocket)
+        # 接続数に関係なくシリアライズは形式ごとに1回のみ
+        disconnected_connections = self._fan_out(self.active_connections, data)
                 
         # 切断された接続を削除
         for websocket in disconnected_connections:
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
                 
-    async def start_price_streaming(self):
-        """価格ライブストリーミング開始"""
-        if self.is_streaming:
-            return
+    async def _fetch_price(self, symbol: str):
+        """
+        1銘柄の価格取得（上流への同時実行数を制限）
+        
+        Args:
+            symbol: 銘柄コード
+            
+        Returns:
+            CurrentPriceData: 価格データ
+        """
+        async with self._price_semaphore:
+            return await self.data_router.get_current_price(symbol, DataSource.AUTO)
             
-        self.is_streaming = True
-        logger.info("価格ライブストリーミング開始")
+    async def _fetch_prices_batch(self, symbols: List[str]) -> List[Any]:
+        """
+        複数銘柄の価格を1リクエストで取得（立花証券APIのバッチ取得）
         
+        Args:
+            symbols: 銘柄コードリスト
+            
+        Returns:
+            List[Any]: 銘柄順の価格データ（取得できなかった銘柄は例外）
+        """
         try:
-            while self.streaming_symbols and self.active_connections:
-                # 取引時間チェック
-                if not is_trading_hours():
-                    # 取引時間外の場合は市場休止メッセージを配信
-                    for symbol in self.streaming_symbols.copy():
-                        market_closed_data = {
-                            "type": "market_closed",
-                            "symbol": symbol,
-                            "timestamp": datetime.now().isoformat(),
-                            "message": "市場時間外（平日9:00-15:00のみライブ配信）",
-                            "source": "market_status"
-                        }
-                        await self.broadcast_to_symbol(symbol, market_closed_data)
+            prices = await asyncio.wait_for(
+                self.data_router.get_multiple_prices(symbols, DataSource.AUTO),
+                timeout=PRICE_FETCH_TIMEOUT
+            )
+        except Exception as e:
+            return [e] * len(symbols)
+            
+        return [
+            prices[symbol] if symbol in prices else LookupError(f"価格データなし: {symbol}")
+            for symbol in symbols
+        ]
+        
+    def start(self):
+        """価格ライブストリーミングの常駐タスクを開始（アプリ起動時に1回だけ呼ぶ）"""
+        if self._streamer_task is None or self._streamer_task.done():
+            self._streamer_task = asyncio.create_task(self._run_price_streaming())
+            
+    async def stop(self):
+        """価格ライブストリーミングの常駐タスクを停止（アプリ終了時）"""
+        if self._streamer_task is None:
+            return
+            
+        self._streamer_task.cancel()
+        try:
+            await self._streamer_task
+        except asyncio.CancelledError:
+            pass
+        self._streamer_task = None
+        
+    async def _run_price_streaming(self):
+        """
+        価格ライブストリーミング（常駐タスク）
+        
+        購読銘柄ができるまで待機し、購読銘柄がある間だけ配信する
+        """
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            await self._have_symbols.wait()
+            self.is_streaming = True
+            logger.info("価格ライブストリーミング開始")
+            
+            try:
+                while self.streaming_symbols:
+                    # 時刻はティックごとに1回だけ取得し、全メッセージで共有する
+                    now = datetime.now()
                     
-                    # 取引時間外は60秒間隔でチェック
-                    await asyncio.sleep(60.0)
-                    continue
-                
-                # 各シンボルの価格を取得して配信
-                for symbol in self.streaming_symbols.copy():
-                    try:
-                        # データソースルーターで価格取得
-                        price_data = await self.data_router.get_current_price(symbol, DataSource.AUTO)
+                    # 取引時間チェック
+                    if not is_trading_hours(now):
+                        # 取引時間外の場合は市場休止メッセージを配信
+                        for symbol in self.streaming_symbols.copy():
+                            market_closed_data = {
+                                "type": "market_closed",
+                                "symbol": symbol,
+                                "timestamp": now,
+                                "message": "市場時間外（平日9:00-15:00のみライブ配信）",
+                                "source": "market_status"
+                            }
+                            await self.broadcast_to_symbol(symbol, market_closed_data)
+                        
+                        # 取引時間外は60秒間隔でチェック
+                        await asyncio.sleep(60.0)
+                        continue
+                    
+                    tick_started = loop.time()
+                    self._tick_wakeup.clear()
+                    
+                    # 各シンボルの価格を並列取得（セマフォ待ちを含めてタイムアウトし、配信間隔内に収める）
+                    # 価格に変化のない銘柄は取得間隔を延ばしている
+                    symbols = [
+                        symbol for symbol in self.streaming_symbols
+                        if self._next_tick_at.get(symbol, 0.0) <= tick_started
+                    ]
+                    if symbols and self.data_router.supports_batch_prices():
+                        # バッチ取得に対応したデータソースでは全銘柄を1リクエストで取得
+                        results = await self._fetch_prices_batch(symbols)
+                    else:
+                        results = await asyncio.gather(
+                            *(asyncio.wait_for(self._fetch_price(symbol), timeout=PRICE_FETCH_TIMEOUT) for symbol in symbols),
+                            return_exceptions=True
+                        )
+                    
+                    for symbol, price_data in zip(symbols, results):
+                        if isinstance(price_data, BaseException):
+                            error = str(price_data) or type(price_data).__name__
+                            logger.warning("価格ストリーミングエラー [%s]: %s", symbol, error)
+                            # エラーメッセージを送信
+                            await self.broadcast_to_symbol(symbol, {
+                                "type": "price_update_error",
+                                "symbol": symbol,
+                                "timestamp": now,
+                                "error": error,
+                                "source": "live_stream"
+                            })
+                            # 復旧後の価格は変化の有無にかかわらず配信する
+                            self._last_price.pop(symbol, None)
+                            self._next_tick_at[symbol] = tick_started + STREAM_INTERVAL_SECONDS
+                            continue
+                        
+                        # 前回配信から価格・出来高が変わっていなければ配信しない
+                        key = (price_data.current_price, price_data.current_volume)
+                        if self._last_price.get(symbol) == key:
+                            self._next_tick_at[symbol] = tick_started + QUIET_STREAM_INTERVAL_SECONDS
+                            continue
+                        self._last_price[symbol] = key
+                        self._next_tick_at[symbol] = tick_started + STREAM_INTERVAL_SECONDS
                         
                         # WebSocket配信
                         stream_data = {
                             "type": "price_update",
                             "symbol": symbol,
-                            "timestamp": datetime.now().isoformat(),
+                            "timestamp": now,
                             "current_price": price_data.current_price,
                             "price_change": price_data.price_change,
                             "price_change_percent": price_data.price_change_percent,
                             "volume": price_data.current_volume,
                             "source": "live_stream"
                         }
-                        
                         await self.broadcast_to_symbol(symbol, stream_data)
-                        
-                    except Exception as e:
-                        logger.warning(f"価格ストリーミングエラー [{symbol}]: {str(e)}")
-                        # エラーメッセージを送信
-                        error_data = {
-                            "type": "price_update_error",
-                            "symbol": symbol,
-                            "timestamp": datetime.now().isoformat(),
-                            "error": str(e),
-                            "source": "live_stream"
-                        }
-                        await self.broadcast_to_symbol(symbol, error_data)
-                        # エラーが続く場合は少し間隔を空ける
-                        continue
-                        
-                # 配信間隔（調整可能）
-                await asyncio.sleep(2.0)  # 2秒間隔
+                            
+                    # 次に取得予定の銘柄まで待機（全銘柄が静かな間は長く待つ。新規購読で起床）
+                    next_due = min(
+                        (self._next_tick_at.get(symbol, 0.0) for symbol in self.streaming_symbols),
+                        default=tick_started + STREAM_INTERVAL_SECONDS
+                    )
+                    try:
+                        await asyncio.wait_for(self._tick_wakeup.wait(), timeout=max(0.0, next_due - loop.time()))
+                    except asyncio.TimeoutError:
+                        pass
+                    
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"ライブストリーミングエラー: {str(e)}")
+                # 異常終了時は配信間隔を空けてから再開
+                await asyncio.sleep(STREAM_INTERVAL_SECONDS)
+            finally:
+                self.is_streaming = False
+                logger.info("価格ライブストリーミング停止")
                 
-        except Exception as e:
-            logger.error(f"ライブストリーミングエラー: {str(e)}")
-        finally:
-            self.is_streaming = False
-            logger.info("価格ライブストリーミング停止")
-            
     async def get_status(self) -> Dict[str, Any]:
         """接続マネージャー状態取得"""
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "active_connections": len(self.active_connections),
             "authenticated_users": len(self.user_connections),
             "streaming_symbols": list(self.streaming_symbols),
@@ -339,15 +660,15 @@ async def websocket_live_endpoint(websocket: WebSocket):
                     
             elif message_type == "status":
                 status = await connection_manager.get_status()
-                await websocket.send_json({
+                connection_manager.send_to(websocket, {
                     "type": "status_response",
                     "data": status
                 })
                 
             elif message_type == "ping":
-                await websocket.send_json({
+                connection_manager.send_to(websocket, {
                     "type": "pong",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": datetime.now()
                 })
                 
     except WebSocketDisconnect:
@@ -402,24 +723,24 @@ async def websocket_authenticated_endpoint(websocket: WebSocket):
                             DataSource.AUTO
                         )
                         
-                        # AI判断結果をリアルタイム配信
+                        # AI判断結果をリアルタイム配信（dataclassはorjsonがネストごと直接シリアライズ）
                         ai_response = {
                             "type": "ai_decision_result",
                             "symbol": symbol,
-                            "timestamp": datetime.now().isoformat(),
-                            "decision_data": decision_data.__dict__,
+                            "timestamp": datetime.now(),
+                            "decision_data": decision_data,
                             "premium_feature": True,
                             "user_id": user_id
                         }
                         
-                        await websocket.send_json(ai_response)
+                        connection_manager.send_to(websocket, ai_response)
                         
                     except Exception as e:
-                        await websocket.send_json({
+                        connection_manager.send_to(websocket, {
                             "type": "ai_decision_error",
                             "symbol": symbol,
                             "error": str(e),
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": datetime.now()
                         })
                         
             elif message_type == "unsubscribe":
@@ -429,7 +750,7 @@ async def websocket_authenticated_endpoint(websocket: WebSocket):
                     
             elif message_type == "status":
                 status = await connection_manager.get_status()
-                await websocket.send_json({
+                connection_manager.send_to(websocket, {
                     "type": "status_response",
                     "data": status
                 })
@@ -2,16 +2,32 @@
 Authentication middleware and utilities for FastAPI + Supabase
 """
 from typing import Optional, Dict, Any
+from dataclasses import dataclass
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import ExpiringSet, SingleFlight, TTLCache
+from app.core.config import settings
 from app.core.supabase_client import supabase_client
+import base64
+import hashlib
+import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
+# 検証済みトークン → ユーザー情報のキャッシュ（トークンのSHA-256ハッシュをキーとする）
+_token_cache = TTLCache(maxsize=10000, ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS)
+# ユーザーID → プロフィールのキャッシュ
+_profile_cache = TTLCache(maxsize=5000, ttl=settings.AUTH_PROFILE_CACHE_TTL_SECONDS)
+# 検証中のトークン（同一トークンの同時リクエストはSupabaseへの問い合わせを1回にまとめる）
+_pending_verifications = SingleFlight()
+# ログアウト済みトークンの失効リスト（トークンの残り有効期間だけ保持し、件数による追い出しはしない）
+_revoked_tokens = ExpiringSet(ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 class AuthenticationError(HTTPException):
     """Custom authentication error"""
     def __init__(self, detail: str = "Authentication failed"):
@@ -21,6 +37,116 @@ class AuthenticationError(HTTPException):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+@dataclass(slots=True)
+class UserPayload:
+    """User fields returned by the auth endpoints"""
+    id: str
+    email: str
+    full_name: str = ""
+    username: str = ""
+    created_at: str = ""
+    email_confirmed_at: str = ""
+    
+    @classmethod
+    def from_supabase(cls, user: Any) -> "UserPayload":
+        """Build from a Supabase user object"""
+        metadata = user.user_metadata or {}
+        email_confirmed_at = user.email_confirmed_at
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=metadata.get("full_name", ""),
+            username=metadata.get("username", ""),
+            created_at=str(user.created_at),
+            email_confirmed_at=str(email_confirmed_at) if email_confirmed_at else ""
+        )
+    
+    @classmethod
+    def from_user_dict(cls, user: Dict[str, Any]) -> "UserPayload":
+        """Build from the user dict returned by get_current_user"""
+        metadata = user.get("user_metadata") or {}
+        return cls(
+            id=user.get("sub", user.get("id", "")),
+            email=user.get("email", ""),
+            full_name=metadata.get("full_name", ""),
+            username=metadata.get("username", ""),
+            created_at=user.get("created_at", ""),
+            email_confirmed_at=user.get("email_confirmed_at", "")
+        )
+
+def _token_cache_key(token: str) -> str:
+    """Build the token cache key without keeping the raw token in memory"""
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+def _token_claims(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode the payload of a JWT without verifying its signature (None if malformed)
+
+    Only used to bound cache lifetimes and to reject obviously invalid tokens
+    early; the signature is still checked by Supabase before anything is cached.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, TypeError):
+        return None
+    return claims if isinstance(claims, dict) else None
+
+def _claims_expiry(claims: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Read the `exp` claim as a UNIX timestamp"""
+    exp = claims.get("exp") if claims else None
+    try:
+        return float(exp) if exp is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _token_expiry(token: str) -> Optional[float]:
+    """Read the `exp` claim from a JWT without verifying its signature"""
+    return _claims_expiry(_token_claims(token))
+
+def revoke_token(token: str) -> None:
+    """
+    Revoke a bearer token until it expires (stateless logout)
+    """
+    cache_key = _token_cache_key(token)
+    exp = _token_expiry(token)
+    ttl = exp - time.time() if exp is not None else None
+    _revoked_tokens.add(cache_key, ttl)
+    _token_cache.pop(cache_key)
+
+async def _verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a bearer token, serving repeated tokens from the TTL cache
+
+    Concurrent cache misses for the same token share a single Supabase call.
+    """
+    cache_key = _token_cache_key(token)
+    if cache_key in _revoked_tokens:
+        return None
+    
+    user = _token_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    # Malformed or already expired tokens are rejected without a Supabase round trip
+    claims = _token_claims(token)
+    if claims is None:
+        return None
+    exp = _claims_expiry(claims)
+    if exp is not None and exp <= time.time():
+        return None
+
+    user = await _pending_verifications.run(cache_key, supabase_client.verify_user, token)
+    if user and cache_key not in _revoked_tokens:
+        ttl = float(settings.AUTH_TOKEN_CACHE_TTL_SECONDS)
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        _token_cache.set(cache_key, user, ttl)
+    return user
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, Any]:
@@ -35,15 +161,15 @@ async def get_current_user(
         if not token:
             raise AuthenticationError("Invalid authentication token")
         
-        # Verify token with Supabase
-        user = await supabase_client.verify_user(token)
+        # Verify token with Supabase (cached per token)
+        user = await _verify_token_cached(token)
         if not user:
             raise AuthenticationError("Invalid or expired token")
         
         return user
         
     except Exception as e:
-        logger.error(f"Authentication error: {e}")
+        logger.error("Authentication error: %s", e)
         raise AuthenticationError("Authentication verification failed")
 
 async def get_current_user_profile(
@@ -57,11 +183,17 @@ async def get_current_user_profile(
         if not user_id:
             return None
         
+        profile = _profile_cache.get(user_id)
+        if profile is not None:
+            return profile
+        
         profile = await supabase_client.get_user_profile(user_id)
+        if profile:
+            _profile_cache.set(user_id, profile)
         return profile
         
     except Exception as e:
-        logger.error(f"Failed to get user profile: {e}")
+        logger.error("Failed to get user profile: %s", e)
         return None
 
 async def get_optional_current_user(
@@ -76,11 +208,11 @@ async def get_optional_current_user(
             return None
         
         token = auth_header.split(" ")[1]
-        user = await supabase_client.verify_user(token)
+        user = await _verify_token_cached(token)
         return user
         
     except Exception as e:
-        logger.debug(f"Optional auth failed: {e}")
+        logger.debug("Optional auth failed: %s", e)
         return None
 
 def require_roles(*roles: str):
@@ -105,10 +237,7 @@ async def create_user_session(email: str, password: str) -> Optional[Dict[str, A
     Create user session with email/password
     """
     try:
-        if not supabase_client.client:
-            raise Exception("Supabase client not initialized")
-        
-        response = supabase_client.client.auth.sign_in_with_password({
+        response = await supabase_client.sign_in_with_password({
             "email": email,
             "password": password
         })
@@ -120,7 +249,7 @@ async def create_user_session(email: str, password: str) -> Optional[Dict[str, A
         }
         
     except Exception as e:
-        logger.error(f"Failed to create user session: {e}")
+        logger.error("Failed to create user session: %s", e)
         return None
 
 async def register_user(email: str, password: str, **metadata) -> Optional[Dict[str, Any]]:
@@ -128,10 +257,7 @@ async def register_user(email: str, password: str, **metadata) -> Optional[Dict[
     Register new user with email/password
     """
     try:
-        if not supabase_client.client:
-            raise Exception("Supabase client not initialized")
-        
-        response = supabase_client.client.auth.sign_up({
+        response = await supabase_client.sign_up({
             "email": email,
             "password": password,
             "options": {
@@ -145,7 +271,7 @@ async def register_user(email: str, password: str, **metadata) -> Optional[Dict[
         }
         
     except Exception as e:
-        logger.error(f"Failed to register user: {e}")
+        logger.error("Failed to register user: %s", e)
         return None
 
 async def get_current_user_from_token(token: str) -> Dict[str, Any]:
@@ -165,13 +291,13 @@ async def get_current_user_from_token(token: str) -> Dict[str, Any]:
         if not token:
             raise AuthenticationError("No authentication token provided")
         
-        # Verify token with Supabase
-        user = await supabase_client.verify_user(token)
+        # Verify token with Supabase (cached per token, so reconnects skip the round trip)
+        user = await _verify_token_cached(token)
         if not user:
             raise AuthenticationError("Invalid or expired token")
         
         return user
         
     except Exception as e:
-        logger.error(f"Token authentication error: {e}")
+        logger.error("Token authentication error: %s", e)
         raise AuthenticationError("Token verification failed")
\ No newline at end of file
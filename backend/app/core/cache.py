@@ -0,0 +1,222 @@
+"""
+In-process TTL cache utilities
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import functools
+import heapq
+import time
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache whose entries expire after a TTL
+
+    Entries are evicted in least-recently-used order once ``maxsize`` is
+    reached. Expiry uses ``time.monotonic`` so wall-clock jumps do not
+    resurrect or prematurely drop entries.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (defaults to the cache TTL)"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value if it has not expired"""
+        item = self._data.pop(key, None)
+        if item is None or item[0] <= time.monotonic():
+            return default
+        return item[1]
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class ExpiringSet:
+    """
+    Set whose members are kept until their own TTL expires
+
+    Unlike ``TTLCache`` there is no size bound: members are never evicted
+    early, so it is safe for deny-lists such as revoked tokens. Expired
+    members are pruned in expiry order (via a heap) on every add and lookup.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._expires: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # Tie-breaker so keys themselves never need to be comparable
+        self._counter = 0
+
+    def add(self, key: Hashable, ttl: Optional[float] = None) -> None:
+        """Add ``key`` for ``ttl`` seconds (defaults to the set TTL); re-adding extends it"""
+        ttl = self.ttl if ttl is None else ttl
+        self._prune()
+        if ttl <= 0:
+            return
+
+        expires_at = max(time.monotonic() + ttl, self._expires.get(key, 0.0))
+        self._expires[key] = expires_at
+        self._counter += 1
+        heapq.heappush(self._heap, (expires_at, self._counter, key))
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            # Skip stale heap entries left behind when a key was re-added with a later expiry
+            if self._expires.get(key) == expires_at:
+                del self._expires[key]
+
+    def clear(self) -> None:
+        """Drop every member"""
+        self._expires.clear()
+        self._heap.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._prune()
+        return key in self._expires
+
+    def __len__(self) -> int:
+        self._prune()
+        return len(self._expires)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key
+
+    While a call for ``key`` is running, later callers await the same task
+    instead of starting another one. Callers wait through ``asyncio.shield``
+    so a cancelled (e.g. timed-out) caller does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Return ``await func(*args)``, sharing the call with concurrent callers of ``key``"""
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(func(*args))
+            self._pending[key] = task
+            task.add_done_callback(functools.partial(self._release, key))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        # Retrieve the exception so a failure nobody awaited is not reported as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+def async_ttl_cache(
+    ttl: float,
+    maxsize: int = 128,
+    key_builder: Optional[Callable[..., Hashable]] = None
+):
+    """
+    Cache the result of an async function (e.g. a FastAPI endpoint) for ``ttl`` seconds
+
+    ``key_builder`` receives the call arguments and returns the cache key;
+    by default every positional and keyword argument is part of the key.
+    Cached values are shared between callers and must not be mutated.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        store = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key_builder is not None:
+                key = key_builder(*args, **kwargs)
+            else:
+                key = (args, tuple(sorted(kwargs.items())))
+
+            result = store.get(key, _MISSING)
+            if result is _MISSING:
+                result = await func(*args, **kwargs)
+                store.set(key, result)
+            return result
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorator
+
+
+# Per-second ISO strings keyed by "utc" (True) or local time (False)
+_iso_cache = {True: (0, ""), False: (0, "")}
+
+
+def _cached_now_iso(utc: bool) -> str:
+    now = int(time.time())
+    cached_second, cached_iso = _iso_cache[utc]
+    if now != cached_second:
+        if utc:
+            cached_iso = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+        else:
+            cached_iso = datetime.fromtimestamp(now).isoformat()
+        _iso_cache[utc] = (now, cached_iso)
+    return cached_iso
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time as a naive ISO-8601 string, formatted at most once per second
+
+    Calls within the same wall-clock second share one string instead of
+    building and formatting a new datetime each time.
+    """
+    return _cached_now_iso(True)
+
+
+def local_now_iso() -> str:
+    """
+    Current local time as a naive ISO-8601 string (``datetime.now().isoformat()``
+    truncated to the second), formatted at most once per second
+    """
+    return _cached_now_iso(False)
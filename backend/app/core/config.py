@@ -1,7 +1,8 @@
 """
 Application configuration using Pydantic Settings
 """
-from typing import List, Optional
+from functools import cached_property, lru_cache
+from typing import Any, FrozenSet, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 import os
@@ -32,12 +33,23 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = Field(default="", env="SUPABASE_URL")
     SUPABASE_ANON_KEY: str = Field(default="", env="SUPABASE_ANON_KEY")
     SUPABASE_SERVICE_KEY: str = Field(default="", env="SUPABASE_SERVICE_KEY")
+    # Max concurrent token verifications sent to Supabase Auth (extra callers wait)
+    SUPABASE_AUTH_CONCURRENCY: int = Field(default=20, env="SUPABASE_AUTH_CONCURRENCY")
+    # Worker threads for blocking calls when only the sync Supabase client is available
+    SUPABASE_EXEC_WORKERS: int = Field(default=16, env="SUPABASE_EXEC_WORKERS")
+    
+    # Outbound HTTP (shared by Supabase / OpenAI)
+    HTTP_POOL_MAX_CONNECTIONS: int = Field(default=100, env="HTTP_POOL_MAX_CONNECTIONS")
+    HTTP_POOL_MAX_KEEPALIVE: int = Field(default=50, env="HTTP_POOL_MAX_KEEPALIVE")
+    HTTP_TIMEOUT_SECONDS: float = Field(default=30.0, env="HTTP_TIMEOUT_SECONDS")
     
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     
     # OpenAI
     OPENAI_API_KEY: str = Field(default="", env="OPENAI_API_KEY")
+    # Per-request timeout for LLM calls (the shared HTTP client's timeout is sized for short API calls)
+    OPENAI_TIMEOUT_SECONDS: float = Field(default=600.0, env="OPENAI_TIMEOUT_SECONDS")
     
     # Tachibana Securities API
     TACHIBANA_USER_ID: str = Field(default="", env="TACHIBANA_USER_ID")
@@ -57,7 +69,7 @@ class Settings(BaseSettings):
     # Database (optional direct connection)
     DATABASE_URL: Optional[str] = Field(default=None, env="DATABASE_URL")
     
-    # CORS
+    # CORS (JSON list in the environment, e.g. CORS_ORIGINS=["http://localhost:3000"])
     CORS_ORIGINS: List[str] = Field(
         default=["http://localhost:3000", "http://localhost:3001"]
     )
@@ -71,6 +83,8 @@ class Settings(BaseSettings):
     
     # AI Provider API Keys
     GEMINI_API_KEY: Optional[str] = Field(default=None, env="GEMINI_API_KEY")
+    AI_BACKTEST_CONCURRENCY: int = Field(default=5, env="AI_BACKTEST_CONCURRENCY")  # バックテスト時の同時LLM呼び出し数
+    AI_BACKTEST_FETCH_CONCURRENCY: int = Field(default=4, env="AI_BACKTEST_FETCH_CONCURRENCY")  # バックテスト用データ取得スレッド数（全リクエスト共有）
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
@@ -79,6 +93,8 @@ class Settings(BaseSettings):
     CACHE_TTL_MINUTES: int = Field(default=5, env="CACHE_TTL_MINUTES")
     CACHE_TTL_HOURS: int = Field(default=1, env="CACHE_TTL_HOURS")
     CACHE_TTL_DAYS: int = Field(default=1, env="CACHE_TTL_DAYS")
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = Field(default=30, env="AUTH_TOKEN_CACHE_TTL_SECONDS")
+    AUTH_PROFILE_CACHE_TTL_SECONDS: int = Field(default=60, env="AUTH_PROFILE_CACHE_TTL_SECONDS")
     
     # File Paths
     DATA_DIR: Path = BASE_DIR / "data"
@@ -100,18 +116,31 @@ class Settings(BaseSettings):
         
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Create directories if they don't exist
-        self.DATA_DIR.mkdir(parents=True, exist_ok=True)
-        self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
-        
         # Set debug based on environment
         if self.ENVIRONMENT == "production":
             self.DEBUG = False
+    
+    @cached_property
+    def CORS_ORIGINS_SET(self) -> FrozenSet[str]:
+        """CORS origins as a frozenset for O(1) per-request origin checks"""
+        return frozenset(self.CORS_ORIGINS)
+    
+    def ensure_directories(self):
+        """Create data/log directories if they don't exist (called once on startup)"""
+        self.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once; .env is parsed on first use only"""
+    return Settings()
 
-# Create settings instance
-settings = Settings()
+# Commonly used settings, resolved lazily from the cached instance
+_SETTINGS_ALIASES = ("PROJECT_NAME", "VERSION", "API_V1_STR")
 
-# Export commonly used settings
-PROJECT_NAME = settings.PROJECT_NAME
-VERSION = settings.VERSION
-API_V1_STR = settings.API_V1_STR
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    if name == "settings":
+        return get_settings()
+    if name in _SETTINGS_ALIASES:
+        return getattr(get_settings(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,57 @@
+"""
+Shared outbound HTTP clients
+
+One pooled sync client and one pooled async client are shared by every
+outbound integration (Supabase, OpenAI) so keep-alive connections and TLS
+sessions are reused across requests instead of being set up per call.
+"""
+from typing import Optional
+import logging
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS)
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide pooled sync HTTP client"""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(limits=_limits(), timeout=_timeout())
+    return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the process-wide pooled async HTTP client"""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+    return _async_client
+
+
+async def close_http_clients():
+    """Close the shared HTTP clients (application shutdown)"""
+    global _sync_client, _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+    logger.info("Shared HTTP clients closed")
@@ -0,0 +1,83 @@
+"""
+orjson-based JSON encoding shared by HTTP and streaming responses
+"""
+from typing import Any, Dict, Iterable, Iterator
+
+import numpy as np
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+# msgpack is only needed for binary WebSocket streams
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# numpy scalars/arrays are common in market data; anything else orjson does
+# not know natively falls back to FastAPI's jsonable_encoder
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any, option: int = 0) -> bytes:
+    """Serialize content to JSON bytes with the shared orjson options"""
+    return orjson.dumps(content, default=jsonable_encoder, option=ORJSON_OPTIONS | option)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Convert values msgpack does not know natively (numpy scalars, datetimes, dataclasses)"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return jsonable_encoder(obj)
+
+
+def msgpack_dumps(content: Any) -> bytes:
+    """Serialize content to msgpack bytes; datetimes are encoded as ISO 8601 strings like in JSON"""
+    return msgpack.packb(content, default=_msgpack_default)
+
+
+def msgpack_array_header(length: int) -> bytes:
+    """msgpack header for an array of ``length`` already-packed items"""
+    return msgpack.Packer().pack_array_header(length)
+
+
+class NumpyORJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also accepts numpy values
+
+    Returning it directly from an endpoint skips FastAPI's jsonable_encoder
+    pass over the whole payload.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def iter_json_with_array(
+    content: Dict[str, Any],
+    array_key: str,
+    items: Iterable[Any],
+    chunk_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encode ``{**content, array_key: [*items]}`` as one JSON document in chunks
+
+    Items are serialized ``chunk_size`` at a time, so a large array is sent
+    while it is being encoded instead of being rendered into a single buffer.
+    """
+    head = dumps(content)
+    separator = b"," if len(head) > 2 else b""
+    yield head[:-1] + separator + dumps(array_key) + b":["
+
+    prefix = b""
+    batch = []
+    for item in items:
+        batch.append(dumps(item))
+        if len(batch) >= chunk_size:
+            yield prefix + b",".join(batch)
+            prefix = b","
+            batch = []
+    if batch:
+        yield prefix + b",".join(batch)
+    yield b"]}"
@@ -1,25 +1,53 @@
 """
 Supabase client setup and configuration
 """
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
 import logging
+from app.core.cache import SingleFlight
 from app.core.config import settings
 
 # Try to import supabase, handle import errors gracefully
 try:
-    from supabase import create_client, Client
+    from app.core.http_client import get_http_client, get_async_http_client
+    from supabase import create_client, Client, ClientOptions
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
     Client = None
 
+# The async client ships with newer supabase-py releases only
+try:
+    from supabase import acreate_client, AsyncClient
+    from supabase.lib.client_options import AsyncClientOptions
+    SUPABASE_ASYNC_AVAILABLE = True
+except ImportError:
+    SUPABASE_ASYNC_AVAILABLE = False
+    AsyncClient = None
+
 logger = logging.getLogger(__name__)
 
+# Profile lookups arriving within this window are fetched with one query
+PROFILE_BATCH_WINDOW_SECONDS = 0.003
+# Max ids per `in_` filter (keeps the PostgREST URL short)
+PROFILE_BATCH_MAX_SIZE = 200
+
 class SupabaseClient:
     """Supabase client wrapper for authentication and database operations"""
     
     def __init__(self):
         self._client: Optional[Client] = None
+        self._async_client: Optional[AsyncClient] = None
+        # Created on first use; blocking sync-client calls run here, off the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Concurrent lookups of the same profile share one query, and lookups of
+        # different profiles are micro-batched into one `in_` query
+        self._profile_lookups = SingleFlight()
+        self._profile_batch: Dict[str, asyncio.Future] = {}
+        self._profile_batch_task: Optional[asyncio.Task] = None
+        # Bursts of token verifications queue here instead of piling onto Supabase Auth
+        self._auth_semaphore = asyncio.Semaphore(settings.SUPABASE_AUTH_CONCURRENCY)
         self._initialize_client()
     
     def _initialize_client(self):
@@ -28,46 +56,189 @@ class SupabaseClient:
             if not SUPABASE_AVAILABLE:
                 logger.warning("Supabase library not available. Client not initialized.")
                 return
-                
+            
             if not settings.SUPABASE_URL or not settings.SUPABASE_ANON_KEY:
                 logger.warning("Supabase configuration is incomplete. Client not initialized.")
                 return
             
-            # Simple client initialization without extra parameters
-            self._client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_ANON_KEY
-            )
-            logger.info("Supabase client initialized successfully")
+            # Share the process-wide pooled HTTP client
+            try:
+                options = ClientOptions(httpx_client=get_http_client())
+            except TypeError:
+                # Older supabase-py versions do not accept an injected client
+                logger.warning("Supabase client does not support httpx_client injection; using default pool")
+                options = None
             
+            if options is not None:
+                self._client = create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_ANON_KEY,
+                    options=options
+                )
+            else:
+                self._client = create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_ANON_KEY
+                )
+            logger.info("Supabase client initialized successfully")
+        
         except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {e}")
+            logger.error("Failed to initialize Supabase client: %s", e)
             self._client = None
     
+    async def initialize_async(self):
+        """
+        Initialize the async Supabase client
+        
+        Must run inside the application's event loop (called from lifespan).
+        Until it succeeds, requests fall back to the sync client.
+        """
+        if self._async_client is not None:
+            return
+        
+        try:
+            if not SUPABASE_AVAILABLE or not SUPABASE_ASYNC_AVAILABLE:
+                logger.warning("Async Supabase client not available. Using sync client.")
+                return
+            
+            if not settings.SUPABASE_URL or not settings.SUPABASE_ANON_KEY:
+                return
+            
+            try:
+                options = AsyncClientOptions(httpx_client=get_async_http_client())
+            except TypeError:
+                options = None
+            
+            if options is not None:
+                self._async_client = await acreate_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_ANON_KEY,
+                    options=options
+                )
+            else:
+                self._async_client = await acreate_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_ANON_KEY
+                )
+            logger.info("Async Supabase client initialized successfully")
+        
+        except Exception as e:
+            logger.error("Failed to initialize async Supabase client: %s", e)
+            self._async_client = None
+    
     @property
     def client(self) -> Optional[Client]:
         """Get the Supabase client instance"""
         return self._client
     
+    @property
+    def async_client(self) -> Optional[AsyncClient]:
+        """Get the async Supabase client instance"""
+        return self._async_client
+    
+    @property
+    def _active_client(self):
+        """Prefer the non-blocking async client when it is initialized"""
+        return self._async_client or self._client
+    
     def is_connected(self) -> bool:
         """Check if Supabase client is properly initialized"""
-        return self._client is not None
+        return self._active_client is not None
+    
+    async def aclose(self):
+        """Drop the async client (pooled connections are closed with the shared HTTP clients)"""
+        self._async_client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    async def _run(self, call: Callable[[Any], Any]) -> Any:
+        """
+        Run ``call(client)`` against the active client
+        
+        The async client is awaited directly; the sync client blocks on HTTP,
+        so it is called in the dedicated Supabase thread pool instead.
+        """
+        if self._async_client is not None:
+            return await call(self._async_client)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.SUPABASE_EXEC_WORKERS,
+                thread_name_prefix="supabase"
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call, self._client)
+    
+    async def sign_in_with_password(self, credentials: Dict[str, Any]):
+        """Sign in with email/password"""
+        if not self._active_client:
+            raise Exception("Supabase client not initialized")
+        return await self._run(lambda client: client.auth.sign_in_with_password(credentials))
+    
+    async def sign_up(self, credentials: Dict[str, Any]):
+        """Register a new user"""
+        if not self._active_client:
+            raise Exception("Supabase client not initialized")
+        return await self._run(lambda client: client.auth.sign_up(credentials))
+    
+    async def sign_out(self):
+        """Sign out the current session"""
+        if self._active_client:
+            await self._run(lambda client: client.auth.sign_out())
     
     async def get_user_profile(self, user_id: str) -> Optional[dict]:
-        """Get user profile from Supabase"""
-        if not self._client:
+        """Get user profile from Supabase (concurrent lookups are batched into one query)"""
+        if not self._active_client:
             return None
         
+        return await self._profile_lookups.run(user_id, self._fetch_user_profile, user_id)
+    
+    async def _fetch_user_profile(self, user_id: str) -> Optional[dict]:
+        """Queue a profile lookup for the next batched query"""
+        future = self._profile_batch.get(user_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._profile_batch[user_id] = future
+        if self._profile_batch_task is None:
+            self._profile_batch_task = asyncio.create_task(self._flush_profile_batch())
+        return await future
+    
+    async def _flush_profile_batch(self):
+        """Fetch every profile queued during the batching window with one query per chunk"""
+        await asyncio.sleep(PROFILE_BATCH_WINDOW_SECONDS)
+        batch, self._profile_batch = self._profile_batch, {}
+        self._profile_batch_task = None
+        
+        profiles_by_id: Dict[str, dict] = {}
         try:
-            response = self._client.table('profiles').select('*').eq('id', user_id).execute()
-            return response.data[0] if response.data else None
-        except Exception as e:
-            logger.error(f"Failed to get user profile: {e}")
-            return None
+            profiles = await self.get_user_profiles(batch, chunk_size=PROFILE_BATCH_MAX_SIZE)
+            profiles_by_id = {profile['id']: profile for profile in profiles}
+        finally:
+            # Waiters always resolve; lookups that failed resolve to None like before
+            for user_id, future in batch.items():
+                if not future.done():
+                    future.set_result(profiles_by_id.get(user_id))
+    
+    async def get_user_profiles(self, user_ids: Iterable[str], chunk_size: int = 100) -> List[dict]:
+        """Get multiple user profiles from Supabase with one query per chunk"""
+        if not self._active_client:
+            return []
+        
+        ids = list(dict.fromkeys(user_ids))
+        profiles: List[dict] = []
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            try:
+                response = await self._run(
+                    lambda client: client.table('profiles').select('*').in_('id', chunk).execute()
+                )
+                profiles.extend(response.data or [])
+            except Exception as e:
+                logger.error("Failed to get user profiles: %s", e)
+        return profiles
     
     async def create_user_profile(self, user_id: str, email: str, **kwargs) -> Optional[dict]:
         """Create user profile in Supabase"""
-        if not self._client:
+        if not self._active_client:
             return None
         
         try:
@@ -76,53 +247,48 @@ class SupabaseClient:
                 'email': email,
                 **kwargs
             }
-            response = self._client.table('profiles').insert(profile_data).execute()
+            response = await self._run(
+                lambda client: client.table('profiles').insert(profile_data).execute()
+            )
             return response.data[0] if response.data else None
         except Exception as e:
-            logger.error(f"Failed to create user profile: {e}")
+            logger.error("Failed to create user profile: %s", e)
             return None
     
     async def verify_user(self, access_token: str) -> Optional[dict]:
         """Verify user authentication with Supabase"""
-        if not self._client:
+        if not self._active_client:
             logger.error("Supabase client not initialized")
             return None
         
         try:
-            logger.info(f"Token verification started - Token: {access_token[:20]}...")
-            logger.info(f"Supabase URL: {settings.SUPABASE_URL}")
-            logger.info(f"Using anon key: {settings.SUPABASE_ANON_KEY[:20]}...")
-            
-            response = self._client.auth.get_user(access_token)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Token verification started - Token: %s...", access_token[:20])
             
-            logger.info(f"Supabase response type: {type(response)}")
-            logger.info(f"Response object: {response}")
+            async with self._auth_semaphore:
+                response = await self._run(lambda client: client.auth.get_user(access_token))
             
-            if response and hasattr(response, 'user') and response.user:
-                logger.info(f"User verified successfully: {response.user.email}")
-                # ユーザーオブジェクトを辞書形式に変換
-                user = response.user
-                user_dict = {
-                    "sub": user.id,
-                    "id": user.id,
-                    "email": user.email,
-                    "email_verified": user.email_confirmed_at is not None,
-                    "app_metadata": user.app_metadata,
-                    "user_metadata": user.user_metadata,
-                    "role": user.role,
-                    "created_at": str(user.created_at) if user.created_at else "",
-                    "email_confirmed_at": str(user.email_confirmed_at) if user.email_confirmed_at else ""
-                }
-                logger.info(f"Returning user dict: {user_dict}")
-                return user_dict
-            else:
-                logger.warning(f"Token verification returned no user - Response: {response}")
+            user = getattr(response, 'user', None) if response else None
+            if not user:
+                logger.warning("Token verification returned no user")
                 return None
+            
+            logger.info("User verified: %s", user.email)
+            # ユーザーオブジェクトを辞書形式に変換
+            return {
+                "sub": user.id,
+                "id": user.id,
+                "email": user.email,
+                "email_verified": user.email_confirmed_at is not None,
+                "app_metadata": user.app_metadata,
+                "user_metadata": user.user_metadata,
+                "role": user.role,
+                "created_at": str(user.created_at) if user.created_at else "",
+                "email_confirmed_at": str(user.email_confirmed_at) if user.email_confirmed_at else ""
+            }
         except Exception as e:
-            logger.error(f"Failed to verify user with token {access_token[:10]}...: {e}")
-            logger.error(f"Exception type: {type(e)}")
-            logger.error(f"Exception details: {str(e)}")
+            logger.error("Failed to verify user token: %s: %s", type(e).__name__, e)
             return None
 
 # Global instance
-supabase_client = SupabaseClient()
\ No newline at end of file
+supabase_client = SupabaseClient()
@@ -3,17 +3,31 @@ FastAPI main application entry point
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
+import logging.handlers
+import queue
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 from app.core.config import settings
+from app.core.http_client import close_http_clients
+from app.core.supabase_client import supabase_client
+from app.api.v1.endpoints.websocket import connection_manager
 
 # Configure basic logging for now
-logging.basicConfig(level=logging.INFO)
+# Request handlers only enqueue records; a background thread writes them to the stream
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.StreamHandler(),
+    respect_handler_level=True
+)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)], force=True)
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
@@ -23,6 +37,9 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting yfinance Trading Platform API...")
+    settings.ensure_directories()
+    await supabase_client.initialize_async()
+    connection_manager.start()
     # TODO: Initialize services
     # - Setup logging
     # - Connect to databases
@@ -33,6 +50,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down yfinance Trading Platform API...")
+    await connection_manager.stop()
+    await supabase_client.aclose()
+    await close_http_clients()
+    log_listener.stop()
     # TODO: Cleanup
     # - Close database connections
     # - Clear cache
@@ -44,6 +65,7 @@ app = FastAPI(
     description="高速トレーディング分析プラットフォーム - AI判断と効率化システム搭載",
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -51,7 +73,7 @@ app = FastAPI(
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=settings.CORS_ORIGINS_SET,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
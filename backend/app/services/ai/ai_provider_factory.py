@@ -4,42 +4,113 @@ AI プロバイダーファクトリー
 設定に基づいて適切なAIプロバイダーを生成・管理
 """
 
+import importlib
 import os
-from typing import Dict, Any, Optional
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Type
 import logging
 
 from .providers.base import AIProviderBase, AIProviderError
-from .providers.openai_provider import OpenAIProvider
-from .providers.gemini_provider import GeminiProvider
 
 logger = logging.getLogger(__name__)
 
 
+class ProviderSpec(NamedTuple):
+    """プロバイダー定義"""
+    module: str  # 実装モジュール（このパッケージからの相対パス）
+    class_name: str  # プロバイダークラス名
+    default_model: str  # デフォルトモデル
+    env_var: str  # APIキーの環境変数名
+
+
 class AIProviderFactory:
     """
     AIプロバイダーを生成・管理するファクトリークラス
     """
     
-    # サポートされているプロバイダー
-    SUPPORTED_PROVIDERS = {
-        "openai": OpenAIProvider,
-        "gemini": GeminiProvider,
+    # サポートされているプロバイダー（名前 → 定義を1回の辞書参照で取得）
+    # SDK（langchain_openai / google.generativeai）のimportが重いため、クラスは初回利用時に読み込む
+    PROVIDERS: Dict[str, ProviderSpec] = {
+        "openai": ProviderSpec(".providers.openai_provider", "OpenAIProvider", "gpt-4o", "OPENAI_API_KEY"),
+        "gemini": ProviderSpec(".providers.gemini_provider", "GeminiProvider", "gemini-2.5-flash", "GEMINI_API_KEY"),
     }
+    _provider_classes: Dict[str, Type[AIProviderBase]] = {}
     
-    # デフォルトモデル設定
-    DEFAULT_MODELS = {
-        "openai": "gpt-4o",
-        "gemini": "gemini-2.5-flash",
-    }
+    # 環境変数の参照結果を再利用する秒数（状況取得APIのポーリング向け）
+    ENV_SNAPSHOT_TTL_SECONDS = 5.0
     
-    # 環境変数名のマッピング
-    ENV_VAR_MAPPING = {
-        "openai": "OPENAI_API_KEY",
-        "gemini": "GEMINI_API_KEY",
-    }
+    # キャッシュするプロバイダー数の上限（APIキーのローテーションやユーザー別キーで無制限に増えないように）
+    MAX_PROVIDERS = int(os.getenv("AI_PROVIDER_CACHE_SIZE", "32"))
     
     def __init__(self):
-        self._provider_cache: Dict[str, AIProviderBase] = {}
+        # (プロバイダー名, モデル名, APIキー) → プロバイダー（LRU順、末尾が最近使用）
+        self._provider_cache: "OrderedDict[Tuple[str, Optional[str], str], AIProviderBase]" = OrderedDict()
+        # キャッシュキーごとの生成ロック（同じプロバイダーを複数スレッドで重複生成しない）
+        self._creation_locks: Dict[Tuple[str, Optional[str], str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        # APIキー設定有無とデフォルトプロバイダーのスナップショット
+        self._env_snapshot: Dict[str, Any] = {}
+        self._env_snapshot_at = float("-inf")
+        # プロバイダー情報のうち実行中に変わらない部分（初回の一覧取得時に構築）
+        self._static_info: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    @classmethod
+    def get_provider_class(cls, provider_name: str) -> Type[AIProviderBase]:
+        """
+        プロバイダークラスを取得（初回呼び出し時にモジュールをimport）
+        
+        Args:
+            provider_name: プロバイダー名 ("openai", "gemini")
+        
+        Returns:
+            Type[AIProviderBase]: プロバイダークラス
+        """
+        provider_class = cls._provider_classes.get(provider_name)
+        if provider_class is None:
+            spec = cls.PROVIDERS[provider_name]
+            module = importlib.import_module(spec.module, __package__)
+            provider_class = cls._provider_classes[provider_name] = getattr(module, spec.class_name)
+        return provider_class
+    
+    def _get_env_snapshot(self) -> Dict[str, Any]:
+        """
+        プロバイダー関連の環境変数を参照（TTL内は前回の結果を再利用）
+        
+        Returns:
+            Dict: APIキー設定有無（プロバイダー別）とデフォルトプロバイダー
+        """
+        now = time.monotonic()
+        if now - self._env_snapshot_at >= self.ENV_SNAPSHOT_TTL_SECONDS:
+            environ = os.environ
+            self._env_snapshot = {
+                "api_keys_configured": {
+                    provider_name: bool(environ.get(spec.env_var))
+                    for provider_name, spec in self.PROVIDERS.items()
+                },
+                "default_provider": environ.get("AI_PROVIDER", "openai"),
+            }
+            self._env_snapshot_at = now
+        return self._env_snapshot
+    
+    @staticmethod
+    def _close_providers(providers: List[AIProviderBase]):
+        """
+        キャッシュから外したプロバイダーの接続を解放
+        
+        Args:
+            providers: 解放するプロバイダー（close() を持つもののみ呼び出す）
+        """
+        for provider in providers:
+            close = getattr(provider, "close", None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                logger.warning("プロバイダーのクローズに失敗: %s: %s", provider.provider_name, e)
     
     def create_provider(self, 
                        provider_name: str, 
@@ -61,61 +132,86 @@ class AIProviderFactory:
         Raises:
             AIProviderError: プロバイダーの作成に失敗した場合
         """
-        provider_name = provider_name.lower()
+        # プロバイダーサポートチェック（小文字で渡された場合はlower()を省略）
+        spec = self.PROVIDERS.get(provider_name)
+        if spec is None:
+            provider_name = provider_name.lower()
+            spec = self.PROVIDERS.get(provider_name)
+            if spec is None:
+                raise AIProviderError(
+                    provider_name,
+                    f"サポートされていないプロバイダー: {provider_name}. "
+                    f"サポートされているプロバイダー: {list(self.PROVIDERS)}"
+                )
         
-        # プロバイダーサポートチェック
-        if provider_name not in self.SUPPORTED_PROVIDERS:
-            raise AIProviderError(
-                provider_name,
-                f"サポートされていないプロバイダー: {provider_name}. "
-                f"サポートされているプロバイダー: {list(self.SUPPORTED_PROVIDERS.keys())}"
-            )
+        # 名前をinternしてキャッシュキー比較を同一性チェックで済ませる
+        provider_name = sys.intern(provider_name)
         
         # APIキーの取得
         if not api_key:
-            env_var = self.ENV_VAR_MAPPING.get(provider_name)
-            api_key = os.getenv(env_var)
+            api_key = os.getenv(spec.env_var)
             
             if not api_key:
                 raise AIProviderError(
                     provider_name,
-                    f"APIキーが見つかりません。環境変数 {env_var} を設定するか、"
+                    f"APIキーが見つかりません。環境変数 {spec.env_var} を設定するか、"
                     f"api_key パラメータを指定してください。"
                 )
         
         # モデルの決定
         if not model:
-            model = self.DEFAULT_MODELS.get(provider_name)
+            model = spec.default_model
         
-        # キャッシュキーの生成
-        cache_key = f"{provider_name}:{model}:{hash(api_key)}"
+        # キャッシュキーの生成（文字列のハッシュは各str内にキャッシュされるため再計算されない）
+        cache_key = (provider_name, model, api_key)
         
-        # キャッシュから取得を試行
-        if cache_key in self._provider_cache:
-            cached_provider = self._provider_cache[cache_key]
-            logger.info(f"キャッシュからプロバイダーを取得: {provider_name}:{model}")
+        # キャッシュから取得を試行（ロックなしの高速パス）
+        cached_provider = self._provider_cache.get(cache_key)
+        if cached_provider is not None:
+            try:
+                self._provider_cache.move_to_end(cache_key)
+            except KeyError:
+                # 直前に他のスレッドが追い出した場合もインスタンスはそのまま使える
+                pass
+            logger.debug("キャッシュからプロバイダーを取得: %s:%s", provider_name, model)
             return cached_provider
         
-        # プロバイダーの作成
-        try:
-            provider_class = self.SUPPORTED_PROVIDERS[provider_name]
-            provider = provider_class(api_key=api_key, model=model, **kwargs)
-            
-            # 設定の妥当性を検証
-            if not provider.validate_configuration():
-                raise AIProviderError(provider_name, "プロバイダー設定の検証に失敗しました")
-            
-            # キャッシュに保存
-            self._provider_cache[cache_key] = provider
-            
-            logger.info(f"新しいプロバイダーを作成: {provider_name}:{model}")
-            return provider
+        with self._lock:
+            creation_lock = self._creation_locks.setdefault(cache_key, threading.Lock())
+        
+        # 同じキーの生成は1スレッドのみ（他のキーの生成はブロックしない）
+        with creation_lock:
+            cached_provider = self._provider_cache.get(cache_key)
+            if cached_provider is not None:
+                return cached_provider
             
-        except Exception as e:
-            if isinstance(e, AIProviderError):
-                raise
-            else:
-                raise AIProviderError(provider_name, f"プロバイダー作成エラー: {str(e)}", e)
+            # プロバイダーの作成
+            try:
+                provider_class = self.get_provider_class(provider_name)
+                provider = provider_class(api_key=api_key, model=model, **kwargs)
+                
+                # 設定の妥当性を検証
+                if not provider.validate_configuration():
+                    raise AIProviderError(provider_name, "プロバイダー設定の検証に失敗しました")
+                
+                # キャッシュに保存（上限を超えたら最も古いものから追い出す）
+                evicted = []
+                with self._lock:
+                    while self._provider_cache and len(self._provider_cache) >= self.MAX_PROVIDERS:
+                        evicted_key, evicted_provider = self._provider_cache.popitem(last=False)
+                        self._creation_locks.pop(evicted_key, None)
+                        evicted.append(evicted_provider)
+                    self._provider_cache[cache_key] = provider
+                self._close_providers(evicted)
+                
+                logger.info("新しいプロバイダーを作成: %s:%s", provider_name, model)
+                return provider
+                
+            except Exception as e:
+                if isinstance(e, AIProviderError):
+                    raise
+                else:
+                    raise AIProviderError(provider_name, f"プロバイダー作成エラー: {str(e)}", e)
     
     def get_default_provider(self, **kwargs) -> AIProviderBase:
         """
@@ -139,32 +235,59 @@ class AIProviderFactory:
             **kwargs
         )
     
-    def list_available_providers(self) -> Dict[str, Dict[str, Any]]:
+    def _get_static_info(self) -> Dict[str, Dict[str, Any]]:
         """
-        利用可能なプロバイダーとその情報を一覧表示
+        プロバイダー情報のうち変化しない部分を取得（クラス名・デフォルトモデル・環境変数名・対応モデル）
         
         Returns:
-            Dict: プロバイダー情報の辞書
+            Dict: プロバイダー名 → 静的なプロバイダー情報
         """
-        providers_info = {}
+        if self._static_info is not None:
+            return self._static_info
         
-        for provider_name, provider_class in self.SUPPORTED_PROVIDERS.items():
-            env_var = self.ENV_VAR_MAPPING.get(provider_name)
-            api_key_available = bool(os.getenv(env_var))
+        static_info = {}
+        complete = True
+        for provider_name, spec in self.PROVIDERS.items():
+            try:
+                supported_models = getattr(self.get_provider_class(provider_name), 'SUPPORTED_MODELS', {})
+            except ImportError as e:
+                logger.warning("プロバイダーを読み込めません: %s: %s", provider_name, e)
+                supported_models = {}
+                complete = False
             
-            providers_info[provider_name] = {
-                "class": provider_class.__name__,
-                "default_model": self.DEFAULT_MODELS.get(provider_name),
-                "env_var": env_var,
-                "api_key_available": api_key_available,
-                "supported_models": getattr(provider_class, 'SUPPORTED_MODELS', {})
+            static_info[provider_name] = {
+                "class": spec.class_name,
+                "default_model": spec.default_model,
+                "env_var": spec.env_var,
+                "supported_models": supported_models
             }
         
-        return providers_info
+        # 読み込めなかったプロバイダーがある場合は次回再試行する
+        if complete:
+            self._static_info = static_info
+        return static_info
+    
+    def list_available_providers(self) -> Dict[str, Dict[str, Any]]:
+        """
+        利用可能なプロバイダーとその情報を一覧表示
+        
+        Returns:
+            Dict: プロバイダー情報の辞書
+        """
+        api_keys_configured = self._get_env_snapshot()["api_keys_configured"]
+        return {
+            provider_name: {**info, "api_key_available": api_keys_configured.get(provider_name, False)}
+            for provider_name, info in self._get_static_info().items()
+        }
     
     def clear_cache(self):
         """プロバイダーキャッシュをクリア"""
-        self._provider_cache.clear()
+        with self._lock:
+            providers = list(self._provider_cache.values())
+            self._provider_cache.clear()
+            self._creation_locks.clear()
+            self._env_snapshot_at = float("-inf")
+        self._close_providers(providers)
         logger.info("プロバイダーキャッシュをクリアしました")
     
     def get_provider_status(self) -> Dict[str, Any]:
@@ -174,18 +297,14 @@ class AIProviderFactory:
         Returns:
             Dict: プロバイダー状況の詳細
         """
-        status = {
+        env_snapshot = self._get_env_snapshot()
+        return {
             "cached_providers": len(self._provider_cache),
-            "available_providers": list(self.SUPPORTED_PROVIDERS.keys()),
-            "default_provider": os.getenv("AI_PROVIDER", "openai"),
-            "api_keys_configured": {}
+            "available_providers": list(self.PROVIDERS),
+            "default_provider": env_snapshot["default_provider"],
+            # APIキー設定状況（呼び出し側での変更がスナップショットに及ばないようコピー）
+            "api_keys_configured": dict(env_snapshot["api_keys_configured"])
         }
-        
-        # APIキー設定状況
-        for provider_name, env_var in self.ENV_VAR_MAPPING.items():
-            status["api_keys_configured"][provider_name] = bool(os.getenv(env_var))
-        
-        return status
 
 
 # グローバルファクトリーインスタンス
@@ -3,17 +3,18 @@
 AI トレーディング判断システム
 
 LangGraphを使用したマルチエージェントワークフローで
-チャート分析・テクニカル分析・売買判断を順次実行します。
+チャート分析・テクニカル分析を並列実行し、その結果から売買判断を行います。
 
 使用方法:
 1. MinuteDecisionPackageデータを入力
-2. チャート分析 → テクニカル分析 → 売買判断の順で実行
+2. チャート分析とテクニカル分析を並列実行 → 両方の完了後に売買判断
 3. 最終的な売買判断結果を取得
 """
 
+import functools
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
@@ -24,12 +25,22 @@ from app.core.data_models import MinuteDecisionPackage, ChartImages
 from app.services.ai.trading_agents import (
     chart_analyst_node,
     technical_analyst_node, 
-    trading_decision_node
+    trading_decision_node,
+    get_trading_agents
 )
+from app.services.ai.trading_tools import _generate_future_entry_conditions, _analyze_market_outlook
 from app.services.efficiency.trading_continuity_engine import TradingContinuityEngine
 
 logger = logging.getLogger(__name__)
 
+# stream_trading_decision で途中結果を返す分析ノードと、その結果が入る状態キー
+ANALYSIS_NODE_RESULT_KEYS = {
+    "chart_analyst": "chart_analysis_result",
+    "technical_analyst": "technical_analysis_result",
+}
+# stream_trading_decision の最終イベント名
+FINAL_DECISION_EVENT = "final_decision"
+
 
 class TradingDecisionState(MessagesState):
     """
@@ -53,6 +64,21 @@ class TradingDecisionState(MessagesState):
     final_decision: Optional[Dict[str, Any]] = None
 
 
+def _non_none_fields(data) -> Dict[str, Any]:
+    """
+    指標データクラスのNone以外のフィールドを辞書に変換
+    
+    Args:
+        data: 指標データ（dataclassインスタンス）
+        
+    Returns:
+        フィールド名 → 値の辞書
+    """
+    if data is None:
+        return {}
+    return {name: value for name, value in vars(data).items() if value is not None}
+
+
 class AITradingDecisionEngine:
     """
     AIトレーディング判断エンジン
@@ -61,6 +87,15 @@ class AITradingDecisionEngine:
     バックテストデータから売買判断を生成します。
     """
     
+    # ログ設定はプロセス内で1回のみ行う
+    _logging_initialized = False
+    
+    # 分析対象の時間軸（長期 → 短期）
+    _TIMEFRAMES = ('weekly', 'daily', 'hourly_60', 'minute_15', 'minute_5', 'minute_1')
+    
+    # 判断結果に付与するエンジンバージョン（分析経路は analysis_efficiency で区別）
+    _ENGINE_VERSION = "1.1.0"
+    
     def __init__(self, enable_logging: bool = True, ai_provider: str = None, ai_model: str = None):
         """
         初期化
@@ -74,128 +109,78 @@ class AITradingDecisionEngine:
         self.ai_provider = ai_provider
         self.ai_model = ai_model
         self._setup_logging()
-        self._workflow = self._build_workflow()
+        self._workflow = self._build_workflow(ai_provider, ai_model)
         self.continuity_engine = TradingContinuityEngine()
         
         provider_info = f" (Provider: {ai_provider}, Model: {ai_model})" if ai_provider else ""
         logger.info(f"🤖 AIトレーディング判断エンジン初期化完了{provider_info}")
     
     def _setup_logging(self):
-        """ログ設定"""
-        if self.enable_logging:
-            log_dir = Path("logs")
-            log_dir.mkdir(exist_ok=True)
-            
-            # LangGraphとエージェント用のログ設定
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                handlers=[
-                    logging.StreamHandler(),
-                    logging.FileHandler(log_dir / 'ai_trading_decision.log')
-                ]
-            )
+        """ログ設定（プロセス内で初回のみ）"""
+        if not self.enable_logging or AITradingDecisionEngine._logging_initialized:
+            return
+        AITradingDecisionEngine._logging_initialized = True
+        
+        # アプリケーション側でルートロガーが設定済みの場合はそのまま使う
+        # （basicConfigは何もしないため、ログファイルを開くだけになる）
+        if logging.getLogger().handlers:
+            return
+        
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        
+        # LangGraphとエージェント用のログ設定
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.StreamHandler(),
+                logging.FileHandler(log_dir / 'ai_trading_decision.log')
+            ]
+        )
     
-    def _build_workflow(self) -> StateGraph:
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _build_workflow(ai_provider: Optional[str], ai_model: Optional[str]) -> StateGraph:
         """
-        LangGraphワークフローを構築
+        LangGraphワークフローを構築（プロバイダー・モデルごとに1回だけ構築し、エンジン間で共有）
+        
+        Args:
+            ai_provider: 使用するAIプロバイダー
+            ai_model: 使用するAIモデル名
         
         Returns:
             コンパイル済みワークフロー
         """
-        # 動的エージェント作成用のカスタムノード関数を作成
-        from .trading_agents import (
-            create_chart_analyst_agent,
-            create_technical_analyst_agent, 
-            create_trading_decision_agent
-        )
-        
-        def dynamic_chart_analyst_node(state):
-            """AIプロバイダー対応チャート分析ノード"""
-            # ワークフロー実行時にプロバイダー情報を取得
-            ai_provider = getattr(self, 'ai_provider', None)
-            ai_model = getattr(self, 'ai_model', None)
-            
-            # 動的にエージェントを作成
-            dynamic_agent = create_chart_analyst_agent(ai_provider, ai_model)
-            
-            # 既存のノード処理をコピー
-            from .trading_agents import chart_analyst_node
-            import types
-            
-            # グローバルエージェントを一時的に置換
-            original_agent = None
-            try:
-                import app.services.ai.trading_agents as agents_module
-                original_agent = agents_module.chart_analyst_agent
-                agents_module.chart_analyst_agent = dynamic_agent
-                
-                return chart_analyst_node(state)
-            finally:
-                if original_agent:
-                    agents_module.chart_analyst_agent = original_agent
-        
-        def dynamic_technical_analyst_node(state):
-            """AIプロバイダー対応テクニカル分析ノード"""
-            ai_provider = getattr(self, 'ai_provider', None)
-            ai_model = getattr(self, 'ai_model', None)
-            
-            dynamic_agent = create_technical_analyst_agent(ai_provider, ai_model)
-            
-            from .trading_agents import technical_analyst_node
-            original_agent = None
-            try:
-                import app.services.ai.trading_agents as agents_module
-                original_agent = agents_module.technical_analyst_agent
-                agents_module.technical_analyst_agent = dynamic_agent
-                
-                return technical_analyst_node(state)
-            finally:
-                if original_agent:
-                    agents_module.technical_analyst_agent = original_agent
-        
-        def dynamic_trading_decision_node(state):
-            """AIプロバイダー対応売買判断ノード"""
-            ai_provider = getattr(self, 'ai_provider', None)
-            ai_model = getattr(self, 'ai_model', None)
-            
-            dynamic_agent = create_trading_decision_agent(ai_provider, ai_model)
-            
-            from .trading_agents import trading_decision_node
-            original_agent = None
-            try:
-                import app.services.ai.trading_agents as agents_module
-                original_agent = agents_module.trading_decision_agent
-                agents_module.trading_decision_agent = dynamic_agent
-                
-                return trading_decision_node(state)
-            finally:
-                if original_agent:
-                    agents_module.trading_decision_agent = original_agent
+        # プロバイダー対応エージェント（プロバイダー・モデルごとに1回だけ作成され、エンジン間で共有）を
+        # ノードに引数として渡す（モジュール変数の差し替えを行わないため並列実行でも安全）
+        chart_agent, technical_agent, decision_agent = get_trading_agents(ai_provider, ai_model)
         
         # ワークフローグラフの定義
         workflow = StateGraph(TradingDecisionState)
         
-        # 動的ノードの追加
-        workflow.add_node("chart_analyst", dynamic_chart_analyst_node)
-        workflow.add_node("technical_analyst", dynamic_technical_analyst_node)
-        workflow.add_node("trading_decision", dynamic_trading_decision_node)
+        # ノードの追加
+        workflow.add_node("chart_analyst", functools.partial(chart_analyst_node, agent=chart_agent))
+        workflow.add_node("technical_analyst", functools.partial(technical_analyst_node, agent=technical_agent))
+        workflow.add_node("trading_decision", functools.partial(trading_decision_node, agent=decision_agent))
         
         # エッジの定義 (実行フロー)
+        # チャート分析とテクニカル分析は互いの結果を使わないため並列実行（LLM呼び出しの待ち時間を重ねる）
         workflow.add_edge(START, "chart_analyst")
-        # chart_analyst_node 内で technical_analyst への遷移を制御
-        # technical_analyst_node 内で trading_decision への遷移を制御
+        workflow.add_edge(START, "technical_analyst")
+        # 両方の分析が完了してから売買判断を実行
+        workflow.add_edge(["chart_analyst", "technical_analyst"], "trading_decision")
         # trading_decision_node 内で END への遷移を制御
         workflow.add_edge("trading_decision", END)
         
         # ワークフローのコンパイル
         compiled_workflow = workflow.compile()
         
-        provider_info = f" (Provider: {self.ai_provider}, Model: {self.ai_model})" if self.ai_provider else ""
+        provider_info = f" (Provider: {ai_provider}, Model: {ai_model})" if ai_provider else ""
         logger.info(f"📊 LangGraphワークフロー構築完了{provider_info}")
         return compiled_workflow
     
-    def analyze_trading_decision(
+    async def analyze_trading_decision(
         self, 
         decision_package: MinuteDecisionPackage,
         force_full_analysis: bool = False
@@ -209,11 +194,35 @@ class AITradingDecisionEngine:
         Returns:
             AI売買判断結果
         """
+        final_decision = None
+        async for event in self.stream_trading_decision(decision_package, force_full_analysis):
+            if event["node"] == FINAL_DECISION_EVENT:
+                final_decision = event["result"]
+        return final_decision
+    
+    async def stream_trading_decision(
+        self, 
+        decision_package: MinuteDecisionPackage,
+        force_full_analysis: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        トレーディング判断分析を実行し、各分析ノードの結果を完了順に返す
+        
+        チャート分析・テクニカル分析の結果を売買判断の完了を待たずに受け取れる。
+        最後のイベントは常に最終判断（analyze_trading_decision と同じ結果）。
+        
+        Args:
+            decision_package: バックテストデータパッケージ
+            force_full_analysis: 継続判断を使わずフル分析を強制するか
+            
+        Yields:
+            {"node": ノード名, "result": 分析結果}（最後は node="final_decision"）
+        """
         try:
             symbol = decision_package.symbol
             current_time = decision_package.timestamp
             
-            logger.info(f"🎯 AI売買判断開始: {symbol} @ {current_time}")
+            logger.info("🎯 AI売買判断開始: %s @ %s", symbol, current_time)
             
             # 効率化分析プランを取得（バックテスト時はキャッシュ無効化）
             if force_full_analysis:
@@ -221,13 +230,16 @@ class AITradingDecisionEngine:
                 logger.info("🚫 バックテスト時キャッシュクリア: 全時間軸を強制分析")
                 analysis_plan = {
                     "analysis_type": "forced_full_analysis",
-                    "timeframes_to_update": ["weekly", "daily", "hourly_60", "minute_15", "minute_5", "minute_1"],
+                    "timeframes_to_update": list(self._TIMEFRAMES),
                     "trading_state": None
                 }
             else:
                 analysis_plan = self.continuity_engine.get_incremental_analysis_plan(symbol, current_time)
             
-            logger.info(f"📋 分析プラン: {analysis_plan['analysis_type']} (更新対象: {len(analysis_plan['timeframes_to_update'])}時間軸)")
+            logger.info("📋 分析プラン: %s (更新対象: %d時間軸)", analysis_plan['analysis_type'], len(analysis_plan['timeframes_to_update']))
+            
+            # 市場環境データ（継続性分析とワークフロー初期状態で共用）
+            market_context = self._prepare_market_context(decision_package)
             
             # 継続性分析を実行（バックテスト時は強制フル分析）
             if force_full_analysis:
@@ -237,7 +249,7 @@ class AITradingDecisionEngine:
                 continuity_result = self.continuity_engine.execute_incremental_analysis(
                     analysis_plan,
                     decision_package.current_price.current_price,
-                    self._prepare_market_context(decision_package)
+                    market_context
                 )
             
             # フル分析が不要な場合は継続結果を返す（バックテスト時は強制実行）
@@ -251,7 +263,7 @@ class AITradingDecisionEngine:
                     "symbol": symbol,
                     "current_price": decision_package.current_price.current_price,
                     "analysis_efficiency": "continuity_based",
-                    "ai_engine_version": "1.1.0_optimized",
+                    "ai_engine_version": self._ENGINE_VERSION,
                     "processing_time": datetime.now().isoformat(),
                     "workflow_status": "efficiency_optimized"
                 })
@@ -262,7 +274,8 @@ class AITradingDecisionEngine:
                     if trading_state:
                         final_decision["future_entry_conditions"] = trading_state.active_conditions
                 
-                return final_decision
+                yield {"node": FINAL_DECISION_EVENT, "result": final_decision}
+                return
             
             # フル分析が必要な場合は従来のワークフローを実行
             if force_full_analysis:
@@ -271,10 +284,21 @@ class AITradingDecisionEngine:
                 logger.info("🔍 フル分析を実行...")
             
             # 入力データの準備（バックテスト時はキャッシュ無効化）
-            initial_state = self._prepare_initial_state(decision_package, disable_cache=force_full_analysis)
+            initial_state = self._prepare_initial_state(
+                decision_package, disable_cache=force_full_analysis, market_context=market_context
+            )
             
-            # ワークフロー実行
-            result = self._workflow.invoke(initial_state)
+            # ワークフロー実行（LLM呼び出しの待ち時間中はイベントループを解放）
+            # 分析ノードの結果は完了した時点で返し、最終状態は values モードで受け取る
+            result = {}
+            async for mode, chunk in self._workflow.astream(initial_state, stream_mode=["updates", "values"]):
+                if mode == "values":
+                    result = chunk
+                    continue
+                for node_name, update in chunk.items():
+                    result_key = ANALYSIS_NODE_RESULT_KEYS.get(node_name)
+                    if result_key and update:
+                        yield {"node": node_name, "result": update.get(result_key)}
             
             # 結果の処理
             final_decision = self._process_workflow_result(result)
@@ -292,7 +316,7 @@ class AITradingDecisionEngine:
                     self.continuity_engine.chart_cache.update_analysis(
                         symbol, timeframe, analysis_summary, current_time
                     )
-                logger.info(f"✅ {len(analysis_plan.get('timeframes_to_update', []))}時間軸の分析完了をキャッシュに記録")
+                logger.info("✅ %d時間軸の分析完了をキャッシュに記録", len(analysis_plan.get('timeframes_to_update', [])))
             
             # 将来エントリー条件とマーケット分析を追加
             self._add_future_analysis(final_decision, initial_state)
@@ -304,19 +328,25 @@ class AITradingDecisionEngine:
             # トレーディング状態を更新
             self.continuity_engine.update_trading_state(symbol, final_decision, current_time)
             
-            logger.info(f"✅ AI売買判断完了: {final_decision.get('trading_decision', 'ERROR')}")
-            return final_decision
+            logger.info("✅ AI売買判断完了: %s", final_decision.get('trading_decision', 'ERROR'))
+            yield {"node": FINAL_DECISION_EVENT, "result": final_decision}
             
         except Exception as e:
-            logger.error(f"❌ AI売買判断エラー: {e}")
-            return self._create_error_response(str(e), decision_package)
+            logger.error("❌ AI売買判断エラー: %s", e)
+            yield {"node": FINAL_DECISION_EVENT, "result": self._create_error_response(str(e), decision_package)}
     
-    def _prepare_initial_state(self, decision_package: MinuteDecisionPackage, disable_cache: bool = False) -> Dict[str, Any]:
+    def _prepare_initial_state(
+        self,
+        decision_package: MinuteDecisionPackage,
+        disable_cache: bool = False,
+        market_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         ワークフロー初期状態を準備
         
         Args:
             decision_package: 判断データパッケージ
+            market_context: 準備済みの市場環境データ（未指定の場合はここで準備）
             
         Returns:
             初期状態データ
@@ -334,7 +364,8 @@ class AITradingDecisionEngine:
             )
         
         # 市場環境データの準備
-        market_context = self._prepare_market_context(decision_package)
+        if market_context is None:
+            market_context = self._prepare_market_context(decision_package)
         
         initial_state = {
             "messages": [
@@ -348,7 +379,7 @@ class AITradingDecisionEngine:
             "market_context": market_context
         }
         
-        logger.debug(f"初期状態準備完了: {len(chart_images)}枚のチャート, {len(technical_indicators)}時間軸")
+        logger.debug("初期状態準備完了: %d枚のチャート, %d時間軸", len(chart_images), len(technical_indicators))
         return initial_state
     
     def _extract_chart_image_paths(self, chart_images: ChartImages) -> Dict[str, str]:
@@ -364,16 +395,15 @@ class AITradingDecisionEngine:
         image_paths = {}
         
         # 各時間軸のチャート画像パス取得
-        timeframes = ['weekly', 'daily', 'hourly_60', 'minute_15', 'minute_5', 'minute_1']
-        
-        for timeframe in timeframes:
+        for timeframe in self._TIMEFRAMES:
             chart_data = getattr(chart_images, timeframe, None)
             if chart_data and hasattr(chart_data, 'imagePath'):
-                image_path = Path(chart_data.imagePath)
-                if image_path.exists():
-                    image_paths[timeframe] = str(image_path)
+                # Pathオブジェクトを作らず文字列のまま存在確認
+                image_path = str(chart_data.imagePath)
+                if os.path.exists(image_path):
+                    image_paths[timeframe] = image_path
                 else:
-                    logger.warning(f"チャート画像が存在しません: {timeframe} - {image_path}")
+                    logger.warning("チャート画像が存在しません: %s - %s", timeframe, image_path)
         
         return image_paths
     
@@ -390,9 +420,7 @@ class AITradingDecisionEngine:
         indicators_dict = {}
         
         # 各時間軸のテクニカル指標を辞書に変換
-        timeframes = ['weekly', 'daily', 'hourly_60', 'minute_15', 'minute_5', 'minute_1']
-        
-        for timeframe in timeframes:
+        for timeframe in self._TIMEFRAMES:
             timeframe_data = getattr(technical_indicators, timeframe, None)
             if timeframe_data:
                 indicators_dict[timeframe] = self._timeframe_indicators_to_dict(timeframe_data)
@@ -413,30 +441,15 @@ class AITradingDecisionEngine:
         
         # 移動平均線
         if hasattr(timeframe_data, 'moving_averages'):
-            ma_data = timeframe_data.moving_averages
-            indicators['moving_averages'] = {
-                attr: getattr(ma_data, attr) 
-                for attr in dir(ma_data) 
-                if not attr.startswith('_') and getattr(ma_data, attr) is not None
-            }
+            indicators['moving_averages'] = _non_none_fields(timeframe_data.moving_averages)
         
         # VWAP
         if hasattr(timeframe_data, 'vwap'):
-            vwap_data = timeframe_data.vwap
-            indicators['vwap'] = {
-                attr: getattr(vwap_data, attr)
-                for attr in dir(vwap_data)
-                if not attr.startswith('_') and getattr(vwap_data, attr) is not None
-            }
+            indicators['vwap'] = _non_none_fields(timeframe_data.vwap)
         
         # ボリンジャーバンド
         if hasattr(timeframe_data, 'bollinger_bands'):
-            bb_data = timeframe_data.bollinger_bands
-            indicators['bollinger_bands'] = {
-                attr: getattr(bb_data, attr)
-                for attr in dir(bb_data)
-                if not attr.startswith('_') and getattr(bb_data, attr) is not None
-            }
+            indicators['bollinger_bands'] = _non_none_fields(timeframe_data.bollinger_bands)
         
         # ATR
         if hasattr(timeframe_data, 'atr14'):
@@ -444,12 +457,7 @@ class AITradingDecisionEngine:
         
         # 出来高プロファイル
         if hasattr(timeframe_data, 'volume_profile'):
-            vp_data = timeframe_data.volume_profile
-            indicators['volume_profile'] = {
-                attr: getattr(vp_data, attr)
-                for attr in dir(vp_data)
-                if not attr.startswith('_') and getattr(vp_data, attr) is not None
-            }
+            indicators['volume_profile'] = _non_none_fields(timeframe_data.volume_profile)
         
         return indicators
     
@@ -472,7 +480,8 @@ class AITradingDecisionEngine:
         
         # 追加の市場データがあれば追加
         if hasattr(decision_package, 'market_context') and decision_package.market_context:
-            market_context.update(decision_package.market_context.__dict__)
+            # Noneのフィールドはプロンプトに載せない
+            market_context.update(_non_none_fields(decision_package.market_context))
         
         return market_context
     
@@ -485,7 +494,6 @@ class AITradingDecisionEngine:
             initial_state: ワークフロー初期状態
         """
         try:
-            from app.services.ai.trading_tools import _generate_future_entry_conditions, _analyze_market_outlook
             
             # 必要なデータの取得
             technical_analysis = initial_state.get("technical_indicators", {})
@@ -505,10 +513,10 @@ class AITradingDecisionEngine:
             )
             final_decision["market_outlook"] = market_outlook
             
-            logger.info(f"✅ 将来エントリー条件とマーケット分析を追加完了")
+            logger.info("✅ 将来エントリー条件とマーケット分析を追加完了")
             
         except Exception as e:
-            logger.warning(f"将来分析の追加に失敗: {e}")
+            logger.warning("将来分析の追加に失敗: %s", e)
             # デフォルト値を設定
             final_decision["future_entry_conditions"] = {
                 "buy_conditions": ["データ不足のため分析不可"],
@@ -540,12 +548,13 @@ class AITradingDecisionEngine:
         
         if not final_decision or "error" in final_decision:
             error_msg = final_decision.get("error", "不明なエラー")
-            logger.error(f"ワークフロー実行エラー: {error_msg}")
+            logger.error("ワークフロー実行エラー: %s", error_msg)
             return self._create_error_response(error_msg)
         
-        # 追加のメタデータを付与
-        final_decision["ai_engine_version"] = "1.0.0"
-        final_decision["processing_time"] = datetime.now().isoformat()
+        # 追加のメタデータを付与（処理時刻は1回だけ取得）
+        now_iso = datetime.now().isoformat()
+        final_decision["ai_engine_version"] = self._ENGINE_VERSION
+        final_decision["processing_time"] = now_iso
         final_decision["workflow_status"] = "completed"
         
         # メッセージログの要約
@@ -553,7 +562,7 @@ class AITradingDecisionEngine:
         final_decision["agent_messages"] = [
             {
                 "agent": getattr(msg, 'name', 'unknown'),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "content_preview": msg.content[:200] + "..." if len(msg.content) > 200 else msg.content
             }
             for msg in messages[-6:]  # 最新6メッセージを保持
@@ -582,7 +591,7 @@ class AITradingDecisionEngine:
             "confidence_level": 0.0,
             "error": error_message,
             "workflow_status": "failed",
-            "ai_engine_version": "1.0.0"
+            "ai_engine_version": self._ENGINE_VERSION
         }
         
         if decision_package:
@@ -602,7 +611,7 @@ class AITradingDecisionEngine:
             ワークフロー情報
         """
         return {
-            "engine_version": "1.0.0",
+            "engine_version": self._ENGINE_VERSION,
             "workflow_type": "multi_agent_trading_decision",
             "agents": [
                 "chart_analyst", 
@@ -610,9 +619,8 @@ class AITradingDecisionEngine:
                 "trading_decision"
             ],
             "execution_order": [
-                "START → chart_analyst",
-                "chart_analyst → technical_analyst", 
-                "technical_analyst → trading_decision",
+                "START → chart_analyst, technical_analyst (並列)",
+                "chart_analyst + technical_analyst → trading_decision",
                 "trading_decision → END"
             ],
             "required_inputs": [
@@ -4,9 +4,23 @@ AIプロバイダーパッケージ
 各AIプロバイダーの実装と基底クラスを提供
 """
 
+import importlib
+
 from .base import AIProviderBase, AIResponse
-from .openai_provider import OpenAIProvider
-from .gemini_provider import GeminiProvider
+
+# SDKのimportが重いプロバイダー実装は、参照されたときに初めて読み込む
+_LAZY_PROVIDERS = {
+    "OpenAIProvider": ".openai_provider",
+    "GeminiProvider": ".gemini_provider",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_PROVIDERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
 
 __all__ = [
     "AIProviderBase",
@@ -10,6 +10,8 @@ import logging
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, AIMessage, SystemMessage
 
+from app.core.config import settings
+from app.core.http_client import get_http_client
 from .base import AIProviderBase, AIResponse, AIProviderError, ModelNotSupportedError
 
 logger = logging.getLogger(__name__)
@@ -50,7 +52,11 @@ class OpenAIProvider(AIProviderBase):
                 api_key=api_key,
                 model=model,
                 temperature=self.temperature,
-                max_tokens=self.max_tokens
+                max_tokens=self.max_tokens,
+                # 共有HTTPクライアントのタイムアウトは短いAPI呼び出し向けのため、LLM応答待ちは個別に指定
+                timeout=settings.OPENAI_TIMEOUT_SECONDS,
+                # プロセス共有のHTTPクライアントで接続を再利用
+                http_client=get_http_client()
             )
             logger.info(f"OpenAI ChatLLM初期化完了: {model}")
             
@@ -8,17 +8,24 @@ LangGraphトレーディングエージェント定義
 3. 売買判断エージェント (trading_decision_agent)
 """
 
+import asyncio
+import base64
+import functools
+import hashlib
 import os
 import logging
-from typing import Dict, Any, List, Literal, Optional
+from typing import Dict, Any, List, Literal, Optional, Tuple
 from datetime import datetime
 
 from langchain_core.messages import HumanMessage, AIMessage
 from .ai_provider_factory import get_ai_provider
+from .langchain_adapter import create_langchain_llm
 from .providers.base import AIProviderBase
 from langgraph.prebuilt import create_react_agent
 from langgraph.types import Command
 
+from app.core.cache import TTLCache
+
 from app.services.ai.trading_tools import (
     analyze_chart_image,
     extract_technical_patterns,
@@ -30,6 +37,9 @@ from app.services.ai.trading_tools import (
 
 logger = logging.getLogger(__name__)
 
+# チャート分析結果のキャッシュ（エージェント・価格・時刻・画像内容が同じ再分析ではビジョンLLMを呼ばない）
+_chart_analysis_cache = TTLCache(maxsize=1024, ttl=3600)
+
 # グローバルプロバイダーキャッシュ（後方互換性のため）
 _default_llm_provider: Optional[AIProviderBase] = None
 
@@ -71,7 +81,6 @@ def create_chart_analyst_agent(ai_provider: Optional[str] = None, ai_model: Opti
         raise RuntimeError("AIプロバイダーが初期化されていません")
     
     # LangChainアダプターでラップして返す
-    from .langchain_adapter import create_langchain_llm
     llm = create_langchain_llm(llm_provider)
     
     # invoke可能なオブジェクトを作成
@@ -79,34 +88,47 @@ def create_chart_analyst_agent(ai_provider: Optional[str] = None, ai_model: Opti
         def __init__(self, llm):
             self.llm = llm
         
+        @staticmethod
+        def _build_prompt(input_data) -> str:
+            # messagesから最後のHumanMessageを取得してプロンプトを作成
+            messages = input_data.get("messages", [])
+            if messages and hasattr(messages[-1], 'content'):
+                # HumanMessageの内容を処理
+                human_message = messages[-1]
+                if isinstance(human_message.content, list):
+                    # 画像付きメッセージの場合、テキスト部分のみを抽出
+                    text_content = ""
+                    for part in human_message.content:
+                        if isinstance(part, dict) and part.get("type") == "text":
+                            text_content += part.get("text", "") + "\n"
+                    return text_content
+                return str(human_message.content)
+            return str(input_data)
+        
         def invoke(self, input_data, **kwargs):
             try:
-                # messagesから最後のHumanMessageを取得してプロンプトを作成
-                messages = input_data.get("messages", [])
-                if messages and hasattr(messages[-1], 'content'):
-                    # HumanMessageの内容を処理
-                    human_message = messages[-1]
-                    if isinstance(human_message.content, list):
-                        # 画像付きメッセージの場合、テキスト部分のみを抽出
-                        text_content = ""
-                        for part in human_message.content:
-                            if isinstance(part, dict) and part.get("type") == "text":
-                                text_content += part.get("text", "") + "\n"
-                        prompt = text_content
-                    else:
-                        prompt = str(human_message.content)
-                else:
-                    prompt = str(input_data)
-                
                 # AIプロバイダーでレスポンスを生成
-                ai_response = self.llm.invoke(prompt)
+                ai_response = self.llm.invoke(self._build_prompt(input_data))
                 
                 # 辞書形式で結果を返す（既存のコードと互換性を保つ）
                 return {
                     "messages": [ai_response]
                 }
             except Exception as e:
-                from langchain_core.messages import AIMessage
+                error_message = AIMessage(content=f"チャート分析エラー: {e}")
+                return {
+                    "messages": [error_message]
+                }
+        
+        async def ainvoke(self, input_data, **kwargs):
+            """非同期版invoke（LangGraphの非同期ノードから呼び出される）"""
+            try:
+                ai_response = await self.llm.ainvoke(self._build_prompt(input_data))
+                
+                return {
+                    "messages": [ai_response]
+                }
+            except Exception as e:
                 error_message = AIMessage(content=f"チャート分析エラー: {e}")
                 return {
                     "messages": [error_message]
@@ -165,8 +187,6 @@ def create_technical_analyst_agent(ai_provider: Optional[str] = None, ai_model:
 分析完了後は「trading_decision」エージェントに結果を渡してください。
 """
     
-    from .langchain_adapter import create_langchain_llm
-    
     llm_provider = _get_llm_provider(ai_provider, ai_model)
     if llm_provider is None:
         raise RuntimeError("AIプロバイダーが初期化されていません")
@@ -246,8 +266,6 @@ def create_trading_decision_agent(ai_provider: Optional[str] = None, ai_model: O
 これが最終判断となります。慎重かつ論理的に分析してください。
 """
     
-    from .langchain_adapter import create_langchain_llm
-    
     llm_provider = _get_llm_provider(ai_provider, ai_model)
     if llm_provider is None:
         raise RuntimeError("AIプロバイダーが初期化されていません")
@@ -262,19 +280,40 @@ def create_trading_decision_agent(ai_provider: Optional[str] = None, ai_model: O
     )
 
 
+@functools.lru_cache(maxsize=8)
+def get_trading_agents(ai_provider: Optional[str] = None, ai_model: Optional[str] = None) -> Tuple[Any, Any, Any]:
+    """
+    プロバイダー・モデルごとのエージェントを取得（初回のみ作成し、全エンジンで共有）
+    
+    Args:
+        ai_provider: AIプロバイダー名（未指定の場合はデフォルト）
+        ai_model: AIモデル名
+    
+    Returns:
+        (チャート分析, テクニカル分析, 売買判断) エージェント
+    """
+    return (
+        create_chart_analyst_agent(ai_provider, ai_model),
+        create_technical_analyst_agent(ai_provider, ai_model),
+        create_trading_decision_agent(ai_provider, ai_model)
+    )
+
+
 # エージェント初期化
-chart_analyst_agent = create_chart_analyst_agent()
-technical_analyst_agent = create_technical_analyst_agent()
-trading_decision_agent = create_trading_decision_agent()
+chart_analyst_agent, technical_analyst_agent, trading_decision_agent = get_trading_agents()
 
 
 # ノード関数定義（LangGraphワークフロー用）
 
-def chart_analyst_node(state: Dict[str, Any]) -> Command[Literal["technical_analyst"]]:
+async def chart_analyst_node(state: Dict[str, Any], agent=None) -> Command:
     """
     チャート分析ノード
     
-    チャート画像を分析し、結果をテクニカル分析エージェントに渡す
+    チャート画像を分析する（テクニカル分析と並列実行され、結果は売買判断ノードで合流）
+    
+    Args:
+        state: ワークフロー状態
+        agent: 使用するエージェント（未指定の場合はデフォルトプロバイダーのエージェント）
     """
     try:
         logger.info("🔍 チャート分析開始")
@@ -301,8 +340,35 @@ def chart_analyst_node(state: Dict[str, Any]) -> Command[Literal["technical_anal
                     "messages": state.get("messages", []) + [
                         AIMessage(content="チャート画像データがないため、テクニカル指標のみで分析を継続します", name="chart_analyst")
                     ]
-                },
-                goto="technical_analyst"
+                }
+            )
+        
+        # チャート画像の読み込み（画像パスには判断時刻が含まれるため内容でキャッシュ判定）
+        image_data = await asyncio.to_thread(_read_chart_images, chart_images)
+        image_digest = hashlib.sha256()
+        for timeframe, data in image_data.items():
+            image_digest.update(timeframe.encode())
+            image_digest.update(data)
+        # エージェントは get_trading_agents でプロセス存続中保持されるため id で識別できる
+        cache_key = (id(agent or chart_analyst_agent), current_price, timestamp, image_digest.hexdigest())
+        
+        analysis_summary = _chart_analysis_cache.get(cache_key)
+        if analysis_summary is not None:
+            logger.info("♻️ チャート分析キャッシュを使用: %d時間軸", len(chart_images))
+            return Command(
+                update={
+                    "chart_analysis_result": {
+                        "timestamp": timestamp,
+                        "current_price": current_price,
+                        "analyzed_timeframes": list(chart_images.keys()),
+                        "analysis_summary": analysis_summary,
+                        "patterns_identified": True,
+                        "confidence_score": 0.7
+                    },
+                    "messages": state.get("messages", []) + [
+                        AIMessage(content=analysis_summary, name="chart_analyst")
+                    ]
+                }
             )
         
         # チャート分析実行
@@ -326,33 +392,20 @@ def chart_analyst_node(state: Dict[str, Any]) -> Command[Literal["technical_anal
         ]
         
         # 各チャート画像をメッセージに追加（⚠️高コスト・高トークン注意）
-        for timeframe, image_info in chart_images.items():
-            image_path = ""
-            if isinstance(image_info, dict):
-                image_path = image_info.get('imagePath', '')
-            else:
-                image_path = str(image_info)
-            
-            if image_path and os.path.exists(image_path):
-                try:
-                    # Base64エンコードした画像データを追加
-                    import base64
-                    with open(image_path, "rb") as img_file:
-                        encoded_image = base64.b64encode(img_file.read()).decode('utf-8')
-                    
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{encoded_image}",
-                            "detail": "high"
-                        }
-                    })
-                    content_parts.append({
-                        "type": "text", 
-                        "text": f"上記画像: {timeframe}チャート"
-                    })
-                except Exception as e:
-                    logger.warning(f"画像読み込みエラー {timeframe}: {e}")
+        for timeframe, data in image_data.items():
+            # Base64エンコードした画像データを追加
+            encoded_image = base64.b64encode(data).decode('utf-8')
+            content_parts.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/png;base64,{encoded_image}",
+                    "detail": "high"
+                }
+            })
+            content_parts.append({
+                "type": "text", 
+                "text": f"上記画像: {timeframe}チャート"
+            })
         
         # 画像付きで分析を実行
         logger.info(f"🖼️ チャート画像分析実行: {len(chart_images)}時間軸")
@@ -363,7 +416,8 @@ def chart_analyst_node(state: Dict[str, Any]) -> Command[Literal["technical_anal
             ]
         }
         
-        result = chart_analyst_agent.invoke(input_data)
+        result = await (agent or chart_analyst_agent).ainvoke(input_data)
+        _chart_analysis_cache.set(cache_key, result["messages"][-1].content)
         
         # 分析結果の構造化
         chart_analysis_result = {
@@ -383,8 +437,7 @@ def chart_analyst_node(state: Dict[str, Any]) -> Command[Literal["technical_anal
                 "messages": state.get("messages", []) + [
                     AIMessage(content=result["messages"][-1].content, name="chart_analyst")
                 ]
-            },
-            goto="technical_analyst"
+            }
         )
         
     except Exception as e:
@@ -399,16 +452,19 @@ def chart_analyst_node(state: Dict[str, Any]) -> Command[Literal["technical_anal
                 "messages": state.get("messages", []) + [
                     AIMessage(content=f"チャート分析でエラーが発生しました: {e}", name="chart_analyst")
                 ]
-            },
-            goto="technical_analyst"
+            }
         )
 
 
-def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_decision"]]:
+async def technical_analyst_node(state: Dict[str, Any], agent=None) -> Command:
     """
     テクニカル分析ノード
     
-    テクニカル指標を分析し、結果を売買判断エージェントに渡す
+    テクニカル指標を分析する（チャート分析と並列実行され、結果は売買判断ノードで合流）
+    
+    Args:
+        state: ワークフロー状態
+        agent: 使用するエージェント（未指定の場合はデフォルトプロバイダーのエージェント）
     """
     try:
         logger.info("📊 テクニカル分析開始")
@@ -416,7 +472,6 @@ def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_de
         # 必要なデータの取得
         technical_indicators = state.get("technical_indicators", {})
         current_price = state.get("current_price", 0.0)
-        chart_analysis_result = state.get("chart_analysis_result", {})
         timestamp = state.get("timestamp", datetime.now().isoformat())
         
         if not technical_indicators:
@@ -431,8 +486,7 @@ def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_de
                     "messages": state.get("messages", []) + [
                         AIMessage(content="テクニカル指標データが見つからないため分析をスキップします", name="technical_analyst")
                     ]
-                },
-                goto="trading_decision"
+                }
             )
         
         # テクニカル分析実行
@@ -445,9 +499,6 @@ def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_de
 現在価格: ¥{current_price:,.0f}
 分析時刻: {timestamp}
 
-## チャート分析結果
-{_format_chart_analysis_summary(chart_analysis_result)}
-
 ## テクニカル指標データ
 {_format_technical_indicators_for_analysis(technical_indicators)}
 
@@ -456,7 +507,7 @@ def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_de
             ]
         }
         
-        result = technical_analyst_agent.invoke(input_data)
+        result = await (agent or technical_analyst_agent).ainvoke(input_data)
         
         # 分析結果の構造化
         technical_analysis_result = {
@@ -477,8 +528,7 @@ def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_de
                 "messages": state.get("messages", []) + [
                     AIMessage(content=result["messages"][-1].content, name="technical_analyst")
                 ]
-            },
-            goto="trading_decision"
+            }
         )
         
     except Exception as e:
@@ -493,16 +543,19 @@ def technical_analyst_node(state: Dict[str, Any]) -> Command[Literal["trading_de
                 "messages": state.get("messages", []) + [
                     AIMessage(content=f"テクニカル分析でエラーが発生しました: {e}", name="technical_analyst")
                 ]
-            },
-            goto="trading_decision"
+            }
         )
 
 
-def trading_decision_node(state: Dict[str, Any]) -> Command[Literal["__end__"]]:
+async def trading_decision_node(state: Dict[str, Any], agent=None) -> Command[Literal["__end__"]]:
     """
     売買判断ノード
     
     最終的な売買判断を行い、ワークフローを終了
+    
+    Args:
+        state: ワークフロー状態
+        agent: 使用するエージェント（未指定の場合はデフォルトプロバイダーのエージェント）
     """
     try:
         logger.info("⚖️ 売買判断開始")
@@ -539,7 +592,7 @@ def trading_decision_node(state: Dict[str, Any]) -> Command[Literal["__end__"]]:
             ]
         }
         
-        result = trading_decision_agent.invoke(input_data)
+        result = await (agent or trading_decision_agent).ainvoke(input_data)
         
         # 最終判断結果の構造化
         final_decision = {
@@ -604,6 +657,32 @@ def trading_decision_node(state: Dict[str, Any]) -> Command[Literal["__end__"]]:
 
 # ヘルパー関数
 
+def _read_chart_images(chart_images: Dict[str, Any]) -> Dict[str, bytes]:
+    """
+    チャート画像ファイルを読み込み
+    
+    Args:
+        chart_images: 時間軸別の画像パス（または imagePath を持つ辞書）
+    
+    Returns:
+        時間軸別の画像データ（読み込めなかった画像は含まない）
+    """
+    image_data = {}
+    for timeframe, image_info in chart_images.items():
+        if isinstance(image_info, dict):
+            image_path = image_info.get('imagePath', '')
+        else:
+            image_path = str(image_info)
+        
+        if image_path and os.path.exists(image_path):
+            try:
+                with open(image_path, "rb") as img_file:
+                    image_data[timeframe] = img_file.read()
+            except Exception as e:
+                logger.warning("画像読み込みエラー %s: %s", timeframe, e)
+    return image_data
+
+
 def _format_chart_images_for_analysis(chart_images: Dict[str, str]) -> str:
     """チャート画像情報を分析用にフォーマット"""
     if not chart_images:
@@ -616,7 +695,6 @@ def _format_chart_images_for_analysis(chart_images: Dict[str, str]) -> str:
             image_path = image_info.get('imagePath', '')
             time_range = image_info.get('timeRange', '')
             if image_path:
-                import os
                 if os.path.exists(image_path):
                     formatted.append(f"- {timeframe}: {image_path} ({time_range}) ✓")
                 else:
@@ -625,7 +703,6 @@ def _format_chart_images_for_analysis(chart_images: Dict[str, str]) -> str:
                 formatted.append(f"- {timeframe}: パスが取得できません")
         else:
             # 文字列形式の場合（legacy）
-            import os
             if os.path.exists(str(image_info)):
                 formatted.append(f"- {timeframe}: {image_info} ✓")
             else:
@@ -645,16 +722,6 @@ def _format_technical_indicators_for_analysis(technical_indicators: Dict) -> str
     return "\n".join(formatted)
 
 
-def _format_chart_analysis_summary(chart_analysis: Dict) -> str:
-    """チャート分析結果をサマリー形式でフォーマット"""
-    if "error" in chart_analysis:
-        return f"エラー: {chart_analysis['error']}"
-    
-    summary = chart_analysis.get("analysis_summary", "分析結果なし")
-    confidence = chart_analysis.get("confidence_score", 0.0)
-    return f"信頼度: {confidence:.2f}\n{summary}"
-
-
 def _format_analysis_summary(analysis_result: Dict) -> str:
     """分析結果をサマリー形式でフォーマット"""
     if "error" in analysis_result:
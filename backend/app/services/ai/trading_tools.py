@@ -10,6 +10,7 @@
 
 import json
 import logging
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
@@ -141,9 +142,9 @@ def extract_technical_patterns(chart_analyses: List[Dict]) -> Dict[str, Any]:
             }
         
         # 複数時間軸の整合性チェック
-        trend_directions = [a.get("trend_direction") for a in valid_analyses]
-        bullish_count = trend_directions.count("bullish")
-        bearish_count = trend_directions.count("bearish")
+        trend_counts = Counter(a.get("trend_direction") for a in valid_analyses)
+        bullish_count = trend_counts["bullish"]
+        bearish_count = trend_counts["bearish"]
         
         if bullish_count >= len(valid_analyses) * 0.7:
             pattern_summary["multi_timeframe_alignment"] = True
@@ -765,10 +766,10 @@ def _extract_hold_reasons(technical_analysis: Dict, chart_analysis: Dict) -> Lis
     # 複数時間軸の不一致
     timeframe_signals = technical_analysis.get("timeframe_signals", {})
     if len(timeframe_signals) > 2:
-        signals = [sig.get("signal", "neutral") for sig in timeframe_signals.values()]
-        buy_count = signals.count("buy")
-        sell_count = signals.count("sell")
-        total = len(signals)
+        signal_counts = Counter(sig.get("signal", "neutral") for sig in timeframe_signals.values())
+        buy_count = signal_counts["buy"]
+        sell_count = signal_counts["sell"]
+        total = len(timeframe_signals)
         
         if buy_count < total * 0.6 and sell_count < total * 0.6:
             hold_reasons.append("複数時間軸でシグナル不一致")
@@ -8,11 +8,13 @@ from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, time
 from enum import Enum
 import asyncio
+import functools
 
 from app.core.data_models import CurrentPriceData, MinuteDecisionPackage
 from app.services.minute_decision_engine import MinuteDecisionEngine
 from app.services.tachibana import TachibanaAPIClient
 from app.core.config import settings
+from app.core.cache import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +36,15 @@ class DataSourceRouter:
         self.yfinance_engine = MinuteDecisionEngine()
         self.tachibana_client = TachibanaAPIClient()
         self._tachibana_connected = False
+        # 取得中の現在価格（同一銘柄への同時リクエストは1回の取得にまとめる）
+        self._pending_prices = SingleFlight()
         
         logger.info("データソースルーター初期化完了")
         
+    async def _get_yfinance_decision_data(self, symbol: str, timestamp: datetime) -> MinuteDecisionPackage:
+        """yfinanceエンジンの同期呼び出しをスレッドで実行（イベントループをブロックしない）"""
+        return await asyncio.to_thread(self.yfinance_engine.get_minute_decision_data, symbol, timestamp)
+        
     async def initialize(self) -> bool:
         """
         ルーター初期化（立花証券API接続試行）
@@ -71,6 +79,22 @@ class DataSourceRouter:
         """
         現在価格取得
         
+        同一銘柄・同一ソースの取得が進行中の場合はその結果を共有する
+        
+        Args:
+            symbol: 銘柄コード
+            source: データソース指定
+            
+        Returns:
+            CurrentPriceData: 現在価格データ
+        """
+        # 呼び出し側のタイムアウトでは共有中の取得はキャンセルされない
+        return await self._pending_prices.run((symbol, source), self._fetch_current_price, symbol, source)
+        
+    async def _fetch_current_price(self, symbol: str, source: DataSource) -> CurrentPriceData:
+        """
+        現在価格取得（データソース選択とyfinanceへのフォールバック）
+        
         Args:
             symbol: 銘柄コード
             source: データソース指定
@@ -123,13 +147,13 @@ class DataSourceRouter:
                 return await self._get_hybrid_trading_data(symbol, timestamp)
             else:
                 # yfinanceのみモード
-                return self.yfinance_engine.get_minute_decision_data(symbol, timestamp)
+                return await self._get_yfinance_decision_data(symbol, timestamp)
                 
         except Exception as e:
             logger.error(f"トレーディングデータ取得エラー [{symbol}]: {str(e)}")
             # フォールバック: yfinanceのみ
             logger.info(f"yfinanceにフォールバック: {symbol}")
-            return self.yfinance_engine.get_minute_decision_data(symbol, timestamp)
+            return await self._get_yfinance_decision_data(symbol, timestamp)
             
     async def get_multiple_prices(
         self,
@@ -161,6 +185,18 @@ class DataSourceRouter:
             # フォールバック: yfinance
             return await self._get_yfinance_multiple_prices(symbols)
             
+    def supports_batch_prices(self, source: DataSource = DataSource.AUTO) -> bool:
+        """
+        複数銘柄の価格を1リクエストで取得できるデータソースが選択されるか
+        
+        Args:
+            source: データソース指定
+            
+        Returns:
+            bool: 立花証券APIのバッチ取得が使える場合True
+        """
+        return self._select_optimal_source(source) == DataSource.TACHIBANA and self._tachibana_connected
+        
     def _select_optimal_source(self, source: DataSource) -> DataSource:
         """
         最適なデータソース選択
@@ -205,19 +241,8 @@ class DataSourceRouter:
         
     async def _get_yfinance_price(self, symbol: str) -> CurrentPriceData:
         """yfinanceから価格取得"""
-        # yfinanceエンジンを使用して現在のデータを取得
-        import asyncio
-        from datetime import datetime
-        
-        loop = asyncio.get_event_loop()
-        
         # MinuteDecisionEngineから基本データを取得
-        decision_data = await loop.run_in_executor(
-            None,
-            self.yfinance_engine.get_minute_decision_data,
-            symbol,
-            datetime.now()
-        )
+        decision_data = await self._get_yfinance_decision_data(symbol, datetime.now())
         
         return decision_data.current_price
         
@@ -249,7 +274,7 @@ class DataSourceRouter:
         """
         try:
             # yfinanceベースの分析データ取得
-            base_data = self.yfinance_engine.get_minute_decision_data(symbol, timestamp)
+            base_data = await self._get_yfinance_decision_data(symbol, timestamp)
             
             # 立花証券からリアルタイム価格取得して上書き
             try:
@@ -327,4 +352,13 @@ class DataSourceRouter:
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """非同期コンテキストマネージャー終了"""
-        await self.cleanup()
\ No newline at end of file
+        await self.cleanup()
+
+@functools.lru_cache(maxsize=1)
+def get_data_source_router() -> DataSourceRouter:
+    """
+    プロセス共通のデータソースルーターを取得
+    
+    HTTPエンドポイントとWebSocket配信で同じyfinanceエンジン・立花証券クライアントを共有する
+    """
+    return DataSourceRouter()
@@ -6,6 +6,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from typing import Dict, Optional, List
 import logging
 
@@ -13,6 +14,9 @@ from app.core.data_models import MarketContext, MarketStatus, IndexData
 
 logger = logging.getLogger(__name__)
 
+# 日本時間
+JST = ZoneInfo("Asia/Tokyo")
+
 class MarketDataEngine:
     """市場環境データ取得エンジン"""
     
@@ -277,9 +281,7 @@ class MarketDataEngine:
             # 日本時間での市場セッション判定
             jst_time = timestamp
             if timestamp.tzinfo is not None:
-                import pytz
-                jst = pytz.timezone('Asia/Tokyo')
-                jst_time = timestamp.astimezone(jst).replace(tzinfo=None)
+                jst_time = timestamp.astimezone(JST).replace(tzinfo=None)
             
             hour = jst_time.hour
             minute = jst_time.minute
@@ -5,8 +5,8 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import pytz
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from typing import Optional, Dict, Any, List
 import logging
 from pathlib import Path
@@ -25,6 +25,22 @@ from app.core.data_models import (
 
 logger = logging.getLogger(__name__)
 
+# 日本時間（DSTが無いためreplace(tzinfo=JST)でlocalizeと同等）
+JST = ZoneInfo("Asia/Tokyo")
+
+# 簡単な銘柄名マップ（実際は外部データソースから取得）
+COMPANY_NAMES = {
+    '7203.T': 'トヨタ自動車',
+    '6723.T': 'ルネサスエレクトロニクス',
+    '9984.T': 'ソフトバンクグループ',
+    'AAPL': 'Apple Inc.',
+    'MSFT': 'Microsoft Corporation'
+}
+
+def get_company_name(symbol: str) -> str:
+    """銘柄名を取得（不明な場合は銘柄コード）"""
+    return COMPANY_NAMES.get(symbol, symbol)
+
 class MinuteDecisionEngine:
     """毎分判断データ生成エンジン"""
     
@@ -258,9 +274,7 @@ class MinuteDecisionEngine:
             if data.index.tz is not None:
                 # データにタイムゾーンがある場合、end_timeもタイムゾーン化
                 if end_time.tzinfo is None:
-                    import pytz
-                    jst = pytz.timezone('Asia/Tokyo')
-                    end_time = jst.localize(end_time)
+                    end_time = end_time.replace(tzinfo=JST)
                 filtered_data = data[data.index <= end_time]
             else:
                 # データにタイムゾーンがない場合、end_timeもnaive化
@@ -298,9 +312,7 @@ class MinuteDecisionEngine:
             if data.index.tz is not None:
                 # データにタイムゾーンがある場合、end_timeもタイムゾーン化
                 if end_time.tzinfo is None:
-                    import pytz
-                    jst = pytz.timezone('Asia/Tokyo')
-                    end_time = jst.localize(end_time)
+                    end_time = end_time.replace(tzinfo=JST)
                 filtered_data = data[data.index <= end_time]
             else:
                 # データにタイムゾーンがない場合、end_timeもnaive化
@@ -420,8 +432,7 @@ class MinuteDecisionEngine:
                 if data.index.tz is not None:
                     if timestamp.tzinfo is None:
                         # timestampがナイーブの場合、Asia/Tokyoタイムゾーンを追加
-                        jst = pytz.timezone('Asia/Tokyo')
-                        timestamp = jst.localize(timestamp)
+                        timestamp = timestamp.replace(tzinfo=JST)
                     else:
                         # timestampのタイムゾーンをdata.indexに合わせる
                         timestamp = timestamp.astimezone(data.index.tz)
@@ -538,15 +549,7 @@ class MinuteDecisionEngine:
     
     def _get_company_name(self, symbol: str) -> str:
         """銘柄名を取得"""
-        # 簡単な銘柄名マップ（実際は外部データソースから取得）
-        name_map = {
-            '7203.T': 'トヨタ自動車',
-            '6723.T': 'ルネサスエレクトロニクス',
-            '9984.T': 'ソフトバンクグループ',
-            'AAPL': 'Apple Inc.',
-            'MSFT': 'Microsoft Corporation'
-        }
-        return name_map.get(symbol, symbol)
+        return get_company_name(symbol)
     
     def _calculate_all_indicators(self, timeframe_data: Dict[str, pd.DataFrame], 
                                 timestamp: datetime) -> TimeframeIndicators:
@@ -2,7 +2,6 @@
 立花証券APIセッション管理
 """
 
-import urllib3
 import urllib.parse
 import json
 import time
@@ -10,18 +9,22 @@ import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
+import httpx
+
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 class TachibanaSessionManager:
     """立花証券APIセッション管理クラス"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.Client] = None):
         self.session_id: Optional[str] = None
         self.virtual_urls: Dict[str, str] = {}
         self.session_expiry: Optional[datetime] = None
-        self.http = urllib3.PoolManager()
+        # 未指定の場合はプロセス共通のHTTPクライアント（接続プール）を使用
+        self._http_client = http_client
         
         # 安全機能: デモモードを強制
         self.is_demo_mode = settings.TACHIBANA_DEMO_MODE
@@ -33,6 +36,11 @@ class TachibanaSessionManager:
         
         logger.info(f"立花証券API初期化: {'デモモード' if self.is_demo_mode else '本番モード'}")
         
+    @property
+    def http(self) -> httpx.Client:
+        """HTTPクライアント取得"""
+        return self._http_client or get_http_client()
+        
     def login(self, user_id: str, password: str) -> bool:
         """
         立花証券APIにログイン
@@ -74,8 +82,7 @@ class TachibanaSessionManager:
             logger.info(f"立花証券APIログイン試行: {login_url}")
             logger.info(f"ログインパラメータ: userid={user_id}")
             
-            response = self.http.request(
-                'GET',
+            response = self.http.get(
                 login_url,
                 headers={
                     'User-Agent': 'yfinance-trading-platform/1.0'
@@ -83,22 +90,22 @@ class TachibanaSessionManager:
             )
             
             # レスポンス処理
-            logger.info(f"レスポンスステータス: {response.status}")
-            logger.info(f"レスポンスデータ: {response.data}")
+            logger.info(f"レスポンスステータス: {response.status_code}")
+            logger.info(f"レスポンスデータ: {response.content}")
             
-            if response.status == 200:
+            if response.status_code == 200:
                 try:
-                    response_text = response.data.decode('shift-jis')
+                    response_text = response.content.decode('shift-jis')
                     logger.info(f"デコード済みレスポンス: {response_text}")
                     response_data = json.loads(response_text)
                 except UnicodeDecodeError:
                     # UTF-8でも試行
-                    response_text = response.data.decode('utf-8')
+                    response_text = response.content.decode('utf-8')
                     logger.info(f"UTF-8デコード済みレスポンス: {response_text}")
                     response_data = json.loads(response_text)
                 except json.JSONDecodeError as e:
                     logger.error(f"JSON解析エラー: {e}")
-                    logger.error(f"レスポンス内容: {response.data}")
+                    logger.error(f"レスポンス内容: {response.content}")
                     raise Exception(f"API応答の解析に失敗: {e}")
                 
                 # エラーチェック（立花証券API仕様）
@@ -127,8 +134,8 @@ class TachibanaSessionManager:
                 
                 return True
             else:
-                logger.error(f"立花証券APIログイン失敗: HTTP {response.status}")
-                raise Exception(f"HTTPエラー: {response.status}")
+                logger.error(f"立花証券APIログイン失敗: HTTP {response.status_code}")
+                raise Exception(f"HTTPエラー: {response.status_code}")
                 
         except Exception as e:
             logger.error(f"立花証券APIログインエラー: {str(e)}")
@@ -163,8 +170,7 @@ class TachibanaSessionManager:
             # ログアウトURL構築
             logout_url = f"{self.base_url}?{encoded_json}"
             
-            response = self.http.request(
-                'GET',
+            response = self.http.get(
                 logout_url,
                 headers={
                     'User-Agent': 'yfinance-trading-platform/1.0'
@@ -253,15 +259,15 @@ class TachibanaSessionManager:
             response = self.http.request(
                 'GET',
                 url,
-                body=encoded_json,
+                content=encoded_json,
                 headers={
                     'Content-Type': 'application/json; charset=Shift-JIS'
                 }
             )
             
             # レスポンス処理
-            if response.status == 200:
-                response_data = json.loads(response.data.decode('shift-jis'))
+            if response.status_code == 200:
+                response_data = json.loads(response.content.decode('shift-jis'))
                 
                 # エラーチェック
                 if 'p_errno' in response_data and response_data['p_errno'] != 0:
@@ -271,7 +277,7 @@ class TachibanaSessionManager:
                     
                 return response_data
             else:
-                raise Exception(f"HTTPエラー: {response.status}")
+                raise Exception(f"HTTPエラー: {response.status_code}")
                 
         except Exception as e:
             logger.error(f"立花証券APIリクエストエラー: {str(e)}")
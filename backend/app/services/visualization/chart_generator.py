@@ -11,6 +11,7 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from jinja2 import Template
 from selenium import webdriver
@@ -218,26 +219,21 @@ class ChartImageGenerator:
     
     def _prepare_chart_data(self, data: pd.DataFrame, indicators: Dict) -> Dict:
         """チャートデータの準備"""
-        # ローソク足データの変換
-        candle_data = []
-        volume_data = []
-        
-        for idx, row in data.iterrows():
-            timestamp = int(idx.timestamp())
-            
-            candle_data.append({
-                'time': timestamp,
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close'])
-            })
-            
-            volume_data.append({
-                'time': timestamp,
-                'value': float(row['Volume']),
-                'color': '#26a69a' if row['Close'] >= row['Open'] else '#ef5350'
-            })
+        # ローソク足データの変換（列単位で一括変換してから行を組み立てる）
+        timestamps = data.index.values.astype('datetime64[s]').astype('int64').tolist()
+        ohlc = data[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)
+        opens, highs, lows, closes = ohlc.T.tolist()
+        volumes = data['Volume'].to_numpy(dtype=np.float64).tolist()
+        colors = np.where(ohlc[:, 3] >= ohlc[:, 0], '#26a69a', '#ef5350').tolist()
+        
+        candle_data = [
+            {'time': timestamp, 'open': open_, 'high': high, 'low': low, 'close': close}
+            for timestamp, open_, high, low, close in zip(timestamps, opens, highs, lows, closes)
+        ]
+        volume_data = [
+            {'time': timestamp, 'value': volume, 'color': color}
+            for timestamp, volume, color in zip(timestamps, volumes, colors)
+        ]
         
         # 移動平均線データの準備
         moving_averages = {}
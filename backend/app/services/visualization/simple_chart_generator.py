@@ -11,14 +11,19 @@ import mplfinance as mpf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
+import threading
 
 from app.core.data_models import ChartImages, ChartImageData, TIMEFRAME_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# 日本時間
+JST = ZoneInfo("Asia/Tokyo")
+
 # 日本語フォント設定
 import matplotlib.font_manager as fm
 
@@ -38,6 +43,9 @@ else:
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.unicode_minus'] = False  # マイナス記号文字化け対策
 
+# pyplotはスレッドセーフではないため、描画は同時に1スレッドのみ（エンジンはスレッドプールから呼ばれる）
+_pyplot_lock = threading.Lock()
+
 class SimpleChartGenerator:
     """軽量チャート生成クラス"""
     
@@ -215,26 +223,27 @@ class SimpleChartGenerator:
             title = f"{symbol} - {title_name}\n{start_time} to {end_time}"
             
             # チャート生成
-            fig, axes = mpf.plot(
-                chart_data,
-                type='candle',
-                style=self.mpf_style,
-                volume=True,
-                addplot=addplots if addplots else None,
-                title=title,
-                figsize=(12, 8),
-                tight_layout=True,
-                returnfig=True,
-                savefig=dict(
-                    fname=str(image_path),
-                    dpi=100,
-                    bbox_inches='tight',
-                    facecolor='white'
+            with _pyplot_lock:
+                fig, axes = mpf.plot(
+                    chart_data,
+                    type='candle',
+                    style=self.mpf_style,
+                    volume=True,
+                    addplot=addplots if addplots else None,
+                    title=title,
+                    figsize=(12, 8),
+                    tight_layout=True,
+                    returnfig=True,
+                    savefig=dict(
+                        fname=str(image_path),
+                        dpi=100,
+                        bbox_inches='tight',
+                        facecolor='white'
+                    )
                 )
-            )
-            
-            # リソースを解放
-            plt.close(fig)
+                
+                # リソースを解放
+                plt.close(fig)
             
             logger.info(f"チャート生成完了: {image_path}")
             return str(image_path)
@@ -340,9 +349,7 @@ class SimpleChartGenerator:
             # タイムゾーン考慮でフィルタリング
             if data.index.tz is not None:
                 if target_datetime.tzinfo is None:
-                    import pytz
-                    jst = pytz.timezone('Asia/Tokyo')
-                    target_datetime = jst.localize(target_datetime)
+                    target_datetime = target_datetime.replace(tzinfo=JST)
                 filtered_data = data[data.index <= target_datetime]
             else:
                 if target_datetime.tzinfo is not None:
@@ -383,7 +390,8 @@ class SimpleChartGenerator:
     
     def close(self):
         """リソースのクリーンアップ（matplotlib用）"""
-        plt.close('all')
+        with _pyplot_lock:
+            plt.close('all')
 
 
 # ヘルパー関数
@@ -0,0 +1,120 @@
+"""
+Tests for bearer token verification in app.core.auth
+"""
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.auth import router
+from app.core import auth
+
+
+def _jwt(claims) -> str:
+    """Build an unsigned JWT-shaped token carrying ``claims``"""
+    def encode(data) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}.signature"
+
+
+@pytest.fixture
+def verify_calls(monkeypatch):
+    """Replace the Supabase verification call and record the tokens it receives"""
+    calls = []
+
+    async def verify_user(token):
+        calls.append(token)
+        return {"id": "user-1", "email": "user@example.com"}
+
+    monkeypatch.setattr(auth.supabase_client, "verify_user", verify_user)
+    auth._token_cache.clear()
+    auth._revoked_tokens.clear()
+    yield calls
+    auth._token_cache.clear()
+    auth._revoked_tokens.clear()
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-jwt",
+    "a.b",
+    "header.!!!.signature",
+    f"{_jwt({})[:-10]}.extra.parts.here",
+])
+def test_malformed_token_is_rejected_without_supabase(verify_calls, token):
+    assert asyncio.run(auth._verify_token_cached(token)) is None
+    assert verify_calls == []
+
+
+def test_expired_token_is_rejected_without_supabase(verify_calls):
+    token = _jwt({"sub": "user-1", "exp": int(time.time()) - 60})
+    assert asyncio.run(auth._verify_token_cached(token)) is None
+    assert verify_calls == []
+
+
+def test_valid_token_is_verified_once_and_cached(verify_calls):
+    token = _jwt({"sub": "user-1", "exp": int(time.time()) + 3600})
+
+    async def scenario():
+        first = await auth._verify_token_cached(token)
+        second = await auth._verify_token_cached(token)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == {"id": "user-1", "email": "user@example.com"}
+    assert verify_calls == [token]
+
+
+def test_logged_out_token_is_rejected(verify_calls):
+    app = FastAPI()
+    app.include_router(router, prefix="/auth")
+    token = _jwt({"sub": "user-1", "exp": int(time.time()) + 3600})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestClient(app) as client:
+        assert client.get("/auth/me", headers=headers).status_code == 200
+        assert client.post("/auth/logout", headers=headers).status_code == 200
+        assert client.get("/auth/me", headers=headers).status_code == 401
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    with pytest.raises(auth.AuthenticationError):
+        asyncio.run(auth.get_current_user(credentials))
+    # Only the first request reached Supabase; the revoked token is refused before any lookup
+    assert verify_calls == [token]
+
+
+def test_profile_lookups_are_served_from_cache(monkeypatch):
+    lookups = []
+
+    async def get_user_profile(user_id):
+        lookups.append(user_id)
+        return {"id": user_id, "username": "trader"}
+
+    monkeypatch.setattr(auth.supabase_client, "get_user_profile", get_user_profile)
+    auth._profile_cache.clear()
+
+    async def scenario():
+        user = {"id": "user-1"}
+        return [await auth.get_current_user_profile(user) for _ in range(3)]
+
+    try:
+        assert asyncio.run(scenario()) == [{"id": "user-1", "username": "trader"}] * 3
+        assert lookups == ["user-1"]
+    finally:
+        auth._profile_cache.clear()
+
+
+def test_revocations_are_not_evicted_past_former_capacity(verify_calls):
+    token = _jwt({"sub": "user-1", "exp": int(time.time()) + 3600})
+    auth.revoke_token(token)
+    # The revocation list used to be an LRU cache capped at 100k entries
+    for i in range(100_001):
+        auth.revoke_token(f"logged-out-{i}")
+
+    assert len(auth._revoked_tokens) == 100_002
+    assert asyncio.run(auth._verify_token_cached(token)) is None
+    assert verify_calls == []
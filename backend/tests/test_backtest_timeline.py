@@ -0,0 +1,154 @@
+"""
+バックテストのテスト（タイムライン生成の旧ループ実装との同値性・リクエスト上限・同時実行数）
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from pydantic import ValidationError
+
+# trading エンドポイントはテクニカル指標モジュール経由で pandas_ta を読み込む
+pytest.importorskip("pandas_ta")
+
+from app.api.v1.endpoints import trading
+from app.api.v1.endpoints.trading import (
+    BACKTEST_MAX_DECISIONS,
+    BACKTEST_MAX_INTERVAL_MINUTES,
+    BacktestRequest,
+    _analyze_backtest_timestamp,
+    _build_backtest_timeline,
+)
+
+JST = pytz.timezone('Asia/Tokyo')
+
+
+def _legacy_timeline(start_jst: datetime, end_jst: datetime, interval_minutes: int, max_decisions: int):
+    """ベクトル化前の日単位・分単位ループ（JST壁時計時刻を受け取り、naive UTCを返す）"""
+    start_jst = JST.localize(start_jst)
+    end_jst = JST.localize(end_jst)
+    
+    timeline = []
+    current_date = start_jst.date()
+    end_date = end_jst.date()
+    
+    while current_date <= end_date:
+        # 平日のみ処理
+        if current_date.weekday() < 5:
+            market_start = JST.localize(datetime.combine(current_date, datetime.min.time().replace(hour=9, minute=0)))
+            market_end = JST.localize(datetime.combine(current_date, datetime.min.time().replace(hour=15, minute=0)))
+            
+            if market_start.date() == start_jst.date():
+                if start_jst.time() > market_start.time():
+                    if start_jst.time() <= market_end.time():
+                        market_start = start_jst.replace(second=0, microsecond=0)
+                    else:
+                        current_date += timedelta(days=1)
+                        continue
+            
+            if market_end.date() == end_jst.date():
+                if end_jst.time() < market_start.time():
+                    current_date += timedelta(days=1)
+                    continue
+                elif end_jst.time() < market_end.time():
+                    market_end = end_jst.replace(second=0, microsecond=0)
+            
+            current_time = market_start
+            while current_time <= market_end:
+                timeline.append(current_time.astimezone(pytz.UTC).replace(tzinfo=None))
+                current_time += timedelta(minutes=interval_minutes)
+        
+        current_date += timedelta(days=1)
+    
+    return timeline[:max_decisions]
+
+
+@pytest.mark.parametrize("start, end, interval_minutes, max_decisions", [
+    # 金曜午後 → 週末をまたいで月曜午前
+    (datetime(2025, 7, 4, 13, 17, 45), datetime(2025, 7, 7, 10, 30), 15, 1000),
+    # 昼休み（11:30-12:30）をまたぐ同日内の範囲
+    (datetime(2025, 7, 8, 11, 0), datetime(2025, 7, 8, 13, 0), 5, 1000),
+    # 大引け（15:00）ちょうど・大引け後の開始と終了
+    (datetime(2025, 7, 8, 14, 40), datetime(2025, 7, 9, 15, 0), 10, 1000),
+    (datetime(2025, 7, 8, 15, 0, 30), datetime(2025, 7, 9, 16, 45), 7, 1000),
+    (datetime(2025, 7, 8, 15, 30), datetime(2025, 7, 10, 8, 59), 30, 1000),
+    # 寄り付き前の開始、週末のみの範囲
+    (datetime(2025, 7, 9, 6, 0), datetime(2025, 7, 9, 9, 0), 1, 1000),
+    (datetime(2025, 7, 5, 9, 0), datetime(2025, 7, 6, 15, 0), 5, 1000),
+    # 最大判断回数での打ち切り（複数営業日にまたがる場合を含む）
+    (datetime(2025, 7, 7, 9, 0), datetime(2025, 7, 18, 15, 0), 5, 10),
+    (datetime(2025, 7, 7, 14, 50), datetime(2025, 7, 18, 15, 0), 5, 80),
+    (datetime(2025, 7, 4, 10, 0), datetime(2025, 7, 31, 15, 0), 60, 25),
+])
+def test_timeline_matches_legacy_loop(start, end, interval_minutes, max_decisions):
+    expected = _legacy_timeline(start, end, interval_minutes, max_decisions)
+    assert _build_backtest_timeline(start, end, interval_minutes, max_decisions) == expected
+
+
+def test_timeline_is_truncated_to_max_decisions():
+    timeline = _build_backtest_timeline(datetime(2025, 7, 7, 9, 0), datetime(2025, 7, 18, 15, 0), 5, 10)
+    
+    assert len(timeline) == 10
+    # JST 9:00 = UTC 0:00 から5分間隔
+    assert timeline[0] == datetime(2025, 7, 7, 0, 0)
+    assert timeline[-1] == datetime(2025, 7, 7, 0, 45)
+
+
+def test_timeline_skips_weekend():
+    timeline = _build_backtest_timeline(datetime(2025, 7, 4, 14, 30), datetime(2025, 7, 7, 9, 30), 30, 1000)
+    
+    assert [t.weekday() for t in timeline] == [4, 4, 0, 0]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("max_decisions", 0),
+    ("max_decisions", BACKTEST_MAX_DECISIONS + 1),
+    ("interval_minutes", 0),
+    ("interval_minutes", BACKTEST_MAX_INTERVAL_MINUTES + 1),
+])
+def test_backtest_request_bounds(field, value):
+    with pytest.raises(ValidationError):
+        BacktestRequest(
+            symbol="7203.T",
+            start_time=datetime(2025, 7, 7, 9, 0),
+            end_time=datetime(2025, 7, 7, 15, 0),
+            **{field: value}
+        )
+
+
+def test_backtest_steps_are_bounded_by_request_semaphore(monkeypatch):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def fetch(symbol, timestamp):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return timestamp
+    
+    class StubEngine:
+        async def analyze_trading_decision(self, decision_package, force_full_analysis=False):
+            return {"trading_decision": "HOLD"}
+    
+    monkeypatch.setattr(trading.trading_engine, "get_minute_decision_data", fetch)
+    
+    async def scenario():
+        semaphore = asyncio.Semaphore(2)
+        timestamps = [datetime(2025, 7, 7, 0, minute) for minute in range(10)]
+        return await asyncio.gather(*(
+            _analyze_backtest_timestamp("7203.T", StubEngine(), timestamp, semaphore)
+            for timestamp in timestamps
+        ))
+    
+    results = asyncio.run(scenario())
+    
+    assert len(results) == 10
+    assert peak <= 2
@@ -0,0 +1,186 @@
+"""
+Tests for the in-process cache utilities
+"""
+import asyncio
+
+import pytest
+
+from app.core import cache
+from app.core.cache import ExpiringSet, SingleFlight, TTLCache
+
+
+class FakeClock:
+    """Stand-in for the ``time`` module with a manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache, "time", fake)
+    return fake
+
+
+def test_ttl_cache_entry_expires_after_ttl(clock):
+    store = TTLCache(maxsize=10, ttl=5)
+    store.set("a", 1)
+
+    clock.now += 4.9
+    assert store.get("a") == 1
+
+    clock.now += 0.1
+    assert store.get("a") is None
+    assert "a" not in store
+    assert len(store) == 0
+
+
+def test_ttl_cache_per_entry_ttl(clock):
+    store = TTLCache(maxsize=10, ttl=60)
+    store.set("short", 1, ttl=1)
+    store.set("long", 2)
+    store.set("skipped", 3, ttl=0)
+
+    clock.now += 2
+    assert store.get("short") is None
+    assert store.get("long") == 2
+    assert "skipped" not in store
+
+
+def test_ttl_cache_pop_ignores_expired_entries(clock):
+    store = TTLCache(maxsize=10, ttl=5)
+    store.set("a", 1)
+    clock.now += 5
+    assert store.pop("a", "missing") == "missing"
+    assert len(store) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    store = TTLCache(maxsize=2, ttl=60)
+    store.set("a", 1)
+    store.set("b", 2)
+
+    # Reading "a" makes "b" the least recently used entry
+    assert store.get("a") == 1
+    store.set("c", 3)
+
+    assert "b" not in store
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+    assert len(store) == 2
+
+
+def test_expiring_set_keeps_members_until_their_own_ttl(clock):
+    members = ExpiringSet(ttl=60)
+    members.add("short", ttl=5)
+    members.add("default")
+    members.add("skipped", ttl=0)
+
+    clock.now += 5
+    assert "short" not in members
+    assert "default" in members
+    assert "skipped" not in members
+
+    clock.now += 55
+    assert len(members) == 0
+
+
+def test_expiring_set_re_add_extends_expiry(clock):
+    members = ExpiringSet(ttl=10)
+    members.add("a")
+    clock.now += 8
+    members.add("a")
+
+    clock.now += 8
+    assert "a" in members
+    clock.now += 2
+    assert "a" not in members
+
+
+def test_expiring_set_never_evicts_by_size(clock):
+    members = ExpiringSet(ttl=60)
+    for i in range(50_000):
+        members.add(i)
+
+    assert len(members) == 50_000
+    assert 0 in members
+
+
+def test_single_flight_shares_concurrent_calls():
+    calls = 0
+
+    async def fetch(value):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.run("key", fetch, 21) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+    assert results == [42] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+def test_single_flight_runs_again_after_completion():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def scenario():
+        flight = SingleFlight()
+        return await flight.run("key", fetch), await flight.run("key", fetch)
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_single_flight_cancelled_caller_does_not_cancel_shared_call():
+    release = None
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        flight = SingleFlight()
+
+        impatient = asyncio.create_task(flight.run("key", fetch))
+        patient = asyncio.create_task(flight.run("key", fetch))
+        await asyncio.sleep(0)
+
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+
+        release.set()
+        return await patient, len(flight)
+
+    assert asyncio.run(scenario()) == ("done", 0)
+
+
+def test_single_flight_propagates_errors_to_every_caller():
+    async def fetch():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.run("key", fetch), flight.run("key", fetch), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert [str(error) for error in results] == ["boom", "boom"]
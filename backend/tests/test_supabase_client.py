@@ -0,0 +1,86 @@
+"""
+Tests for profile lookup micro-batching in app.core.supabase_client
+"""
+import asyncio
+from types import SimpleNamespace
+
+from app.core.supabase_client import SupabaseClient
+
+
+class FakeProfilesQuery:
+    """Records `in_` queries against the profiles table like the async Supabase client"""
+
+    def __init__(self, client):
+        self._client = client
+        self._ids = []
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self._ids = list(values)
+        return self
+
+    async def execute(self):
+        self._client.queries.append(self._ids)
+        if self._client.error is not None:
+            raise self._client.error
+        rows = [
+            {"id": user_id, "username": f"user-{user_id}"}
+            for user_id in self._ids
+            if user_id not in self._client.missing_ids
+        ]
+        return SimpleNamespace(data=rows)
+
+
+class FakeAsyncClient:
+    def __init__(self, error=None, missing_ids=()):
+        self.queries = []
+        self.error = error
+        self.missing_ids = set(missing_ids)
+
+    def table(self, name):
+        assert name == "profiles"
+        return FakeProfilesQuery(self)
+
+
+def _client_with(fake) -> SupabaseClient:
+    client = SupabaseClient()
+    client._async_client = fake
+    return client
+
+
+def test_concurrent_profile_lookups_share_one_query():
+    fake = FakeAsyncClient()
+    client = _client_with(fake)
+    user_ids = [str(i) for i in range(10)]
+
+    async def scenario():
+        # Duplicate ids are coalesced into the same lookup
+        return await asyncio.gather(*(client.get_user_profile(user_id) for user_id in user_ids + user_ids[:3]))
+
+    profiles = asyncio.run(scenario())
+
+    assert len(fake.queries) == 1
+    assert sorted(fake.queries[0]) == sorted(user_ids)
+    assert [profile["id"] for profile in profiles] == user_ids + user_ids[:3]
+
+
+def test_missing_profile_resolves_to_none():
+    fake = FakeAsyncClient(missing_ids=["ghost"])
+    client = _client_with(fake)
+
+    assert asyncio.run(client.get_user_profile("ghost")) is None
+    assert fake.queries == [["ghost"]]
+
+
+def test_query_error_resolves_every_waiter_to_none():
+    fake = FakeAsyncClient(error=RuntimeError("PostgREST unavailable"))
+    client = _client_with(fake)
+
+    async def scenario():
+        return await asyncio.gather(*(client.get_user_profile(str(i)) for i in range(5)))
+
+    assert asyncio.run(scenario()) == [None] * 5
+    assert len(fake.queries) == 1
+    assert len(client._profile_lookups) == 0
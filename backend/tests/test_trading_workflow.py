@@ -0,0 +1,62 @@
+"""
+LangGraphトレーディングワークフローのテスト（スタブAIプロバイダーで実行）
+"""
+
+import asyncio
+import os
+
+import pytest
+
+# モジュール読み込み時にデフォルトプロバイダーのエージェントが作成されるため、ダミーのAPIキーを設定
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from app.services.ai import trading_agents
+from app.services.ai.ai_trading_decision import AITradingDecisionEngine
+from app.services.ai.providers.base import AIProviderBase, AIResponse
+
+
+class StubProvider(AIProviderBase):
+    """固定の応答を返すスタブプロバイダー"""
+    
+    def invoke(self, messages):
+        return AIResponse(content="上昇トレンド継続", model=self.model, provider="stub")
+    
+    def invoke_with_system_prompt(self, system_prompt, user_message):
+        return self.invoke([{"role": "user", "content": user_message}])
+    
+    def supports_vision(self):
+        return True
+    
+    def invoke_with_images(self, text, image_data):
+        return self.invoke([{"role": "user", "content": text}])
+
+
+@pytest.fixture
+def stub_workflow(monkeypatch):
+    monkeypatch.setattr(
+        trading_agents,
+        "get_ai_provider",
+        lambda provider_name=None, model=None: StubProvider(api_key="stub", model=model)
+    )
+    return AITradingDecisionEngine._build_workflow("stub", "stub-workflow-model")
+
+
+def test_chart_analysis_runs_through_compiled_workflow(stub_workflow, tmp_path):
+    chart_path = tmp_path / "daily.png"
+    chart_path.write_bytes(b"\x89PNG\r\n\x1a\nstub")
+    
+    state = {
+        "messages": [],
+        "symbol": "7203",
+        "timestamp": "2025-07-01T10:00:00",
+        "current_price": 2500.0,
+        "chart_images": {"daily": str(chart_path)},
+        "technical_indicators": {},
+        "market_context": {},
+    }
+    result = asyncio.run(stub_workflow.ainvoke(state))
+    
+    chart_result = result["chart_analysis_result"]
+    assert "error" not in chart_result
+    assert chart_result["analyzed_timeframes"] == ["daily"]
+    assert chart_result["analysis_summary"] == "上昇トレンド継続"
@@ -0,0 +1,143 @@
+"""
+WebSocket送信キュー（バッチ送信・遅いクライアントの切断）のテスト
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+# websocket エンドポイントはデータソースルーター経由で pandas_ta を読み込む
+pytest.importorskip("pandas_ta")
+
+from fastapi.websockets import WebSocketState
+
+from app.api.v1.endpoints import websocket as ws_endpoint
+from app.api.v1.endpoints.websocket import (
+    BINARY_BATCH_PREFIX,
+    OUTBOUND_QUEUE_BYTES,
+    OUTBOUND_QUEUE_SIZE,
+    ConnectionManager,
+)
+from app.core.responses import MSGPACK_AVAILABLE
+
+
+class FakeWebSocket:
+    """送信フレームとclose呼び出しを記録するWebSocket"""
+    
+    def __init__(self):
+        self.client = SimpleNamespace(host="test-client")
+        self.client_state = WebSocketState.CONNECTED
+        self.text_frames = []
+        self.binary_frames = []
+        self.closed_with = None
+    
+    async def send_text(self, data):
+        self.text_frames.append(data)
+    
+    async def send_bytes(self, data):
+        self.binary_frames.append(data)
+    
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+def _attach(manager: ConnectionManager, websocket: FakeWebSocket, binary: bool = False) -> asyncio.Queue:
+    """connect() と同じ送信キューを登録（送信タスクは各テストで起動）"""
+    queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+    manager.active_connections.add(websocket)
+    manager._outbound[websocket] = queue
+    manager._queued_bytes[websocket] = 0
+    if binary:
+        manager._binary_connections.add(websocket)
+    return queue
+
+
+async def _drain(manager: ConnectionManager, websocket: FakeWebSocket, queue: asyncio.Queue, binary: bool):
+    """キュー済みのメッセージを送信タスクで1回排出して停止"""
+    writer = asyncio.create_task(manager._write_loop(websocket, queue, binary))
+    manager._writers[websocket] = writer
+    # 送信先は即座に完了するため、短い待機後には送信タスクは次のメッセージ待ちになっている
+    await asyncio.sleep(0.01)
+    assert queue.empty()
+    writer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await writer
+
+
+def test_queued_json_messages_are_sent_as_one_batch_frame():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        queue = _attach(manager, websocket)
+        for i in range(3):
+            manager.send_to(websocket, {"type": "price_update", "symbol": "7203", "price": 2500 + i})
+        await _drain(manager, websocket, queue, binary=False)
+        return manager, websocket
+    
+    manager, websocket = asyncio.run(scenario())
+    
+    assert len(websocket.text_frames) == 1
+    frame = json.loads(websocket.text_frames[0])
+    assert frame["type"] == "batch"
+    assert [item["price"] for item in frame["items"]] == [2500, 2501, 2502]
+    assert manager._queued_bytes[websocket] == 0
+
+
+def test_single_json_message_is_sent_unwrapped():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        queue = _attach(manager, websocket)
+        manager.send_to(websocket, {"type": "market_status", "is_open": True})
+        await _drain(manager, websocket, queue, binary=False)
+        return websocket
+    
+    websocket = asyncio.run(scenario())
+    
+    assert [json.loads(frame) for frame in websocket.text_frames] == [{"type": "market_status", "is_open": True}]
+
+
+@pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_queued_binary_messages_are_sent_as_one_msgpack_batch_frame():
+    msgpack = pytest.importorskip("msgpack")
+    
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        queue = _attach(manager, websocket, binary=True)
+        for i in range(3):
+            manager.send_to(websocket, {"type": "price_update", "symbol": "7203", "price": 2500 + i})
+        await _drain(manager, websocket, queue, binary=True)
+        return websocket
+    
+    websocket = asyncio.run(scenario())
+    
+    assert len(websocket.binary_frames) == 1
+    frame = websocket.binary_frames[0]
+    assert frame.startswith(BINARY_BATCH_PREFIX)
+    decoded = msgpack.unpackb(frame)
+    assert decoded["type"] == "batch"
+    assert [item["price"] for item in decoded["items"]] == [2500, 2501, 2502]
+
+
+def test_consumer_over_byte_cap_is_closed_with_1013():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        _attach(manager, websocket)
+        
+        # 送信タスクが排出しない遅いクライアントにバイト数上限を超えるまで積む
+        payload = b"x" * (64 * 1024)
+        accepted = [manager._enqueue(websocket, payload) for _ in range(OUTBOUND_QUEUE_BYTES // len(payload) + 1)]
+        await asyncio.sleep(0)
+        return manager, websocket, accepted
+    
+    manager, websocket, accepted = asyncio.run(scenario())
+    
+    assert accepted[:-1] == [True] * (len(accepted) - 1)
+    assert accepted[-1] is False
+    assert websocket.closed_with == ws_endpoint.status.WS_1013_TRY_AGAIN_LATER == 1013
+    assert websocket not in manager._outbound
+    assert websocket not in manager._queued_bytes
@@ -105,32 +105,42 @@ export class WebSocketManager {
     try {
       const message = JSON.parse(data) as WebSocketMessage;
       
-      switch (message.type) {
-        case 'price_update':
-          this.emitEvent('price_update', message as PriceUpdate);
-          this.emitEvent(`price_update:${message.symbol}`, message as PriceUpdate);
-          break;
-        case 'price_update_error':
-          console.warn(`Price update error for ${message.symbol}:`, message.error);
-          this.emitEvent('price_update_error', message);
-          this.emitEvent(`price_update_error:${message.symbol}`, message);
-          break;
-        case 'ai_decision_result':
-          this.emitEvent('ai_decision_result', message.decision_data);
-          this.emitEvent(`ai_decision_result:${message.symbol}`, message.decision_data);
-          break;
-        case 'connection_established':
-          console.log('WebSocket connection established:', message);
-          this.emitEvent('connection_established', message);
-          break;
-        default:
-          this.emitEvent('message', message);
+      // サーバー側でまとめて送信されたメッセージを展開
+      if (message.type === 'batch') {
+        (message.items ?? []).forEach(item => this.dispatchMessage(item));
+        return;
       }
+      
+      this.dispatchMessage(message);
     } catch (error) {
       console.error('Failed to parse WebSocket message:', error);
     }
   }
 
+  private dispatchMessage(message: WebSocketMessage): void {
+    switch (message.type) {
+      case 'price_update':
+        this.emitEvent('price_update', message as PriceUpdate);
+        this.emitEvent(`price_update:${message.symbol}`, message as PriceUpdate);
+        break;
+      case 'price_update_error':
+        console.warn(`Price update error for ${message.symbol}:`, message.error);
+        this.emitEvent('price_update_error', message);
+        this.emitEvent(`price_update_error:${message.symbol}`, message);
+        break;
+      case 'ai_decision_result':
+        this.emitEvent('ai_decision_result', message.decision_data);
+        this.emitEvent(`ai_decision_result:${message.symbol}`, message.decision_data);
+        break;
+      case 'connection_established':
+        console.log('WebSocket connection established:', message);
+        this.emitEvent('connection_established', message);
+        break;
+      default:
+        this.emitEvent('message', message);
+    }
+  }
+
   private emitEvent(eventType: string, data: any): void {
     const handlers = this.eventHandlers.get(eventType) || [];
     handlers.forEach(handler => handler(data));
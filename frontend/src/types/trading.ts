@@ -63,8 +63,9 @@ export interface PriceUpdate {
 }
 
 export interface WebSocketMessage {
-  type: "subscribe" | "ai_decision_request" | "price_update" | "ai_decision_result" | "price_update_error" | "connection_established";
+  type: "subscribe" | "ai_decision_request" | "price_update" | "ai_decision_result" | "price_update_error" | "connection_established" | "batch";
   symbol?: string;
+  items?: WebSocketMessage[];
   decision_data?: AIDecisionResult;
   error?: string;
   [key: string]: any;